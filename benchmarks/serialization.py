@@ -0,0 +1,235 @@
+# Throughput and allocation benchmark for decode_raw_message / encode_raw_message over every
+# registered schema type, with empty, typical and large payloads (K4A image resolutions, meshes).
+# No network is used. Results go to a JSON file that can be compared against an earlier run.
+# Usage: python benchmarks/serialization.py [--output results.json] [--baseline old.json]
+#        [--sizes empty,typical,large] [--types substring] [--repeat N]
+import argparse
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import time
+import timeit
+import tracemalloc
+from enum import Enum
+from inspect import isclass
+from importlib.metadata import PackageNotFoundError, version
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+from pycdr2 import IdlStruct, IdlUnion
+from pycdr2._type_helper import get_args, get_origin
+from pycdr2._type_normalize import get_extended_type_hints
+from pycdr2.types import array, bounded_str, sequence, typedef, uint8, _type_code_align_size_default_mapping
+
+# Run from a checkout without installing the package
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import tcnart.core  # noqa: F401 (registers PixelImage)
+import tcnart.schema.messages.srg_engine  # noqa: F401
+from tcnart.serialization.cdr_serialization import _TYPE_REGISTRY, decode_raw_message, encode_raw_message
+
+# Blob sizes for the large variants: Azure Kinect color (BGRA) and depth/IR (uint16) modes, and
+# meshes as 24 byte vertices plus 12 byte faces
+K4A_IMAGES = {
+    "color_720p_bgra": 1280 * 720 * 4,
+    "color_1080p_bgra": 1920 * 1080 * 4,
+    "color_1536p_bgra": 2048 * 1536 * 4,
+    "depth_nfov_unbinned": 640 * 576 * 2,
+    "depth_wfov_unbinned": 1024 * 1024 * 2,
+}
+MESHES = {
+    "mesh_50k": 50_000 * 24 + 100_000 * 12,
+    "mesh_250k": 250_000 * 24 + 500_000 * 12,
+}
+# Messages whose bulk uint8 member carries images or meshes
+_LARGE_VARIANTS = {
+    "tcnart_msgs::msg::VideoStreamMessage": K4A_IMAGES,
+    "pcpd_msgs::msg::MeshBitstreamMessage": MESHES,
+}
+TYPICAL = {"string": 16, "sequence": 8, "blob": 4096}
+LARGE = {"string": 256, "sequence": 256, "blob": 1 << 20}
+
+
+class _Generator:
+    # Deterministic member values of a given shape; blob is the length of uint8 sequences.
+    # Elements of sequences get the typical shape so nested sequences do not multiply out.
+    def __init__(self, shape: Dict[str, int], blob: int, seed: int = 0):
+        self.shape = shape
+        self.blob = blob
+        self.rng = np.random.default_rng(seed)
+
+    def elements(self, _type: Any, count: int) -> List[Any]:
+        shape, blob = self.shape, self.blob
+        self.shape, self.blob = TYPICAL, TYPICAL["blob"]
+        try:
+            return [self.value(_type) for _ in range(count)]
+        finally:
+            self.shape, self.blob = shape, blob
+
+    def value(self, _type: Any) -> Any:
+        while isinstance(_type, typedef):
+            _type = _type.subtype
+        if _type is str or isinstance(_type, bounded_str):
+            length = self.shape["string"] if not isinstance(_type, bounded_str) else min(self.shape["string"], _type.max_length)
+            return "".join(chr(ord("a") + i % 26) for i in range(length))
+        if _type is bytes:
+            return self.rng.integers(0, 256, self.shape["blob"], dtype=np.uint8).tobytes()
+        if _type in _type_code_align_size_default_mapping:
+            code = _type_code_align_size_default_mapping[_type][0]
+            if code == "?":
+                return True
+            if code in "fd":
+                return float(np.float32(self.rng.uniform(-100, 100)))
+            return int(self.rng.integers(0, 100))
+        if isclass(_type) and issubclass(_type, Enum):
+            return list(_type)[-1]
+        if isclass(_type) and issubclass(_type, IdlStruct):
+            return _type(**{name: self.value(ftype) for name, ftype in get_extended_type_hints(_type).items()})
+        if isclass(_type) and issubclass(_type, IdlUnion):
+            name, case = next(iter(get_extended_type_hints(_type).items()))
+            return _type(**{name: self.value(case.subtype)})
+        if isinstance(_type, array):
+            values = [self.value(_type.subtype) for _ in range(_type.length)]
+            return bytes(values) if _type.subtype == uint8 else values
+        if isinstance(_type, sequence) and _type.subtype == uint8:
+            return self.rng.integers(0, 256, self.blob, dtype=np.uint8).tolist()
+        if isinstance(_type, sequence):
+            count = self.shape["sequence"] if _type.max_length is None else min(self.shape["sequence"], _type.max_length)
+            return self.elements(_type.subtype, count)
+        if get_origin(_type) == list:
+            return self.elements(get_args(_type)[0], self.shape["sequence"])
+        raise TypeError(f"No generator for {_type}")
+
+
+def _cases(sizes: List[str], types: Optional[str]) -> Iterator[Tuple[str, str, Any]]:
+    # Generated lazily: the large variants hold lists of millions of ints
+    for name, cls in _TYPE_REGISTRY.items():
+        if types and types not in name:
+            continue
+        if not (isclass(cls) and issubclass(cls, IdlStruct)):
+            yield name, "skipped", None
+            continue
+        if "empty" in sizes:
+            yield name, "empty", cls()
+        if "typical" in sizes:
+            yield name, "typical", _Generator(TYPICAL, TYPICAL["blob"]).value(cls)
+        if "large" in sizes:
+            for variant, blob in _LARGE_VARIANTS.get(name, {"large": LARGE["blob"]}).items():
+                yield name, variant, _Generator(LARGE, blob).value(cls)
+
+
+def _allocations(fn: Any) -> Dict[str, int]:
+    # Memory allocated by one call: peak while it runs and blocks still alive in its result
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot()
+        base, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        result = fn()
+        current, peak = tracemalloc.get_traced_memory()
+        after = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+    blocks = sum(stat.count_diff for stat in after.compare_to(before, "filename"))
+    del result
+    return {"alloc_peak_bytes": peak - base, "alloc_result_bytes": current - base, "alloc_result_blocks": blocks}
+
+
+def _measure(fn: Any, payload_bytes: int, repeat: int) -> Dict[str, Any]:
+    timer = timeit.Timer(fn)
+    number, _ = timer.autorange()
+    seconds = min(timer.repeat(repeat, number)) / number
+    return {
+        "seconds": seconds,
+        "msgs_per_s": 1.0 / seconds,
+        "mb_per_s": payload_bytes / seconds / 1e6,
+        **_allocations(fn),
+    }
+
+
+def _version(package: str) -> Optional[str]:
+    try:
+        return version(package)
+    except PackageNotFoundError:
+        return None
+
+
+def _peak_rss_bytes() -> int:
+    # ru_maxrss is in kilobytes on Linux but already in bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _compare(results: List[Dict[str, Any]], baseline_path: str) -> None:
+    with open(baseline_path) as f:
+        baseline = {(r["type"], r["size"]): r for r in json.load(f)["results"]}
+    print(f"\n{'type':<52} {'size':<20} {'decode x':>9} {'encode x':>9}")
+    for r in results:
+        old = baseline.get((r["type"], r["size"]))
+        if old is None or "decode" not in r or "decode" not in old:
+            continue
+        ratios = [r[op]["msgs_per_s"] / old[op]["msgs_per_s"] for op in ("decode", "encode")]
+        print(f"{r['type']:<52} {r['size']:<20} {ratios[0]:>8.2f}x {ratios[1]:>8.2f}x")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--output", default="serialization_benchmark.json")
+    parser.add_argument("--baseline", help="earlier --output file to compare msgs/s against")
+    parser.add_argument("--sizes", default="empty,typical,large")
+    parser.add_argument("--types", help="only types whose schema name contains this")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    results = []
+    print(f"{'type':<52} {'size':<20} {'bytes':>10} {'decode msg/s':>13} {'MB/s':>8} {'encode msg/s':>13} {'MB/s':>8}")
+    for name, size, message in _cases(args.sizes.split(","), args.types):
+        if message is None:
+            results.append({"type": name, "size": size, "reason": "not an IdlStruct"})
+            print(f"{name:<52} {size:<20}")
+            continue
+        payload = encode_raw_message(message)
+        decoded = decode_raw_message(name, payload)  # encode what receivers hand out, as republishing does
+        entry = {
+            "type": name,
+            "size": size,
+            "payload_bytes": len(payload),
+            "decode": _measure(lambda: decode_raw_message(name, payload), len(payload), args.repeat),
+            "encode": _measure(lambda: encode_raw_message(decoded), len(payload), args.repeat),
+        }
+        results.append(entry)
+        d, e = entry["decode"], entry["encode"]
+        print(f"{name:<52} {size:<20} {len(payload):>10} {d['msgs_per_s']:>13.1f} {d['mb_per_s']:>8.1f}"
+              f" {e['msgs_per_s']:>13.1f} {e['mb_per_s']:>8.1f}")
+
+    report = {
+        "meta": {
+            "commit": _git_commit(),
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "numpy": np.__version__,
+            "pycdr2": _version("pycdr2"),
+            "peak_rss_bytes": _peak_rss_bytes(),
+        },
+        "results": results,
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Results written to {args.output}")
+    if args.baseline:
+        _compare(results, args.baseline)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+# Compare the generated struct codecs against pycdr2's reflective (de)serialization.
+# Usage: python benchmarks/struct_codecs.py [--number N]
+import argparse
+import os
+import sys
+import timeit
+
+# Run from a checkout without installing the package
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import tcnart.core  # noqa: F401 (registers PixelImage)
+import tcnart.schema.messages.srg_engine  # noqa: F401
+from tcnart.schema.messages.monitor import PerformanceMonitorItem
+from tcnart.schema.types.common import BufferInfo, Header
+from tcnart.schema.types.primitives import CameraModel
+from tcnart.schema.types.transform import RigidTransform
+from tcnart.serialization.cdr_serialization import _CODECS
+from tcnart.serialization.struct_codec import build_struct_codec
+
+
+def _cases():
+    for cls in (RigidTransform, CameraModel, Header, BufferInfo, PerformanceMonitorItem):
+        yield cls.__name__, build_struct_codec(cls), cls()
+    for name, codec in sorted(_CODECS.items()):
+        yield name, codec, codec.cls()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--number", type=int, default=20000)
+    args = parser.parse_args()
+
+    print(f"{'type':<52} {'decode pycdr2':>14} {'generated':>10} {'x':>6} {'encode pycdr2':>14} {'generated':>10} {'x':>6}")
+    for name, codec, message in _cases():
+        payload = message.serialize()
+        assert codec.encode(message) == payload and codec.decode(payload) == codec.cls.deserialize(payload)
+        cls = codec.cls
+        dec_ref = timeit.timeit(lambda: cls.deserialize(payload), number=args.number)
+        dec_gen = timeit.timeit(lambda: codec.decode(payload), number=args.number)
+        enc_ref = timeit.timeit(lambda: message.serialize(), number=args.number)
+        enc_gen = timeit.timeit(lambda: codec.encode(message), number=args.number)
+        us = 1e6 / args.number
+        print(f"{name:<52} {dec_ref * us:>12.2f}us {dec_gen * us:>8.2f}us {dec_ref / dec_gen:>5.1f}x"
+              f" {enc_ref * us:>12.2f}us {enc_gen * us:>8.2f}us {enc_ref / enc_gen:>5.1f}x")
+
+
+if __name__ == "__main__":
+    main()
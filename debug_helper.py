@@ -2,7 +2,9 @@ import logging
 import zenoh
 from tcnart.network.discovery import find_camera_sensors, build_channel_configs
 from tcnart.network.receiver import resolve_stream_descriptors, start_all_receivers
-from tcnart.core.semantic_type import SemanticType
+from tcnart.core.semantic_type import parse_semantic_type
+from tcnart.core.dataflow import Dataflow
+from tcnart.core.frames import TimestampMatcherType
 logging.basicConfig(level=logging.DEBUG)
 
 zenoh_config = "/Users/ecku/mydev/artekmed/zenoh_client_config/ueck_localrouter/zenoh_config.json5"
@@ -18,19 +20,27 @@ channels_config, channel_calibration, channel_poses = build_channel_configs(came
 
 stream_config = resolve_stream_descriptors(topic_prefix, None, channel_calibration, channel_poses, channels_config, session)
 
-worker_senders = []
+num_workers = 8
+worker_channels = [name for name, _ in sorted(stream_config.items(), key=lambda kv: kv[1].stream_id)]
 
 class DbgHelper:
-    def __init__(self, name):
-        self.stream_name = name
     def __call__(self, frame):
-        st = SemanticType(frame.semantic_type)
-        # print(f"received element {self.stream_name}: {st}")
+        st = parse_semantic_type(frame.semantic_type)
+        # print(f"received element {worker_channels[frame.stream_id]}: {st}")
+        return frame
 
-for stream_name in stream_config:
-    worker_senders.append(DbgHelper(stream_name))
+def print_group(group):
+    print(f"group {group.get_ref_timestamp()} missing={group.missing_channels()}")
 
-threads = start_all_receivers(8, None, worker_senders, session, stream_config)
+flow = Dataflow(queue_size=64)
+flow.add_stage("inspect", DbgHelper(), workers=1)
+flow.add_grouper(worker_channels, TimestampMatcherType.new_window(10), max_pending_groups=64)
+flow.add_stage("print", print_group)
+flow.start()
+
+threads = start_all_receivers(num_workers, None, flow.worker_senders(num_workers), session, stream_config)
 
 for thread in threads:
-    thread.join()
\ No newline at end of file
+    thread.join()
+flow.close()
+flow.join()
\ No newline at end of file
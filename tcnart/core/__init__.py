@@ -1,7 +1,10 @@
 # tcnart.core package
 
 from . import semantic_type  # re-export subpackage
+from . import datamodel  # predefined semantic type identifiers
 
 # Optional: expose key classes
-from .frames import Frame, GroupOfFrames, FrameAnnotation, TimestampMatcherType, timestamp_iter
+from .frames import Frame, GroupOfFrames, FrameAnnotation, TimestampMatcherType, TimestampGrouper, timestamp_iter
 from .pixel_image import PixelImage
+from .clock import ClockOffsetEstimator
+from .buffer_pool import BufferPool
@@ -0,0 +1,100 @@
+from __future__ import annotations
+import threading
+import weakref
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Deque, Optional, Set, Tuple
+
+import numpy as np
+
+from ..schema.types.common import BufferInfo
+
+
+@dataclass
+class BufferPoolStats:
+    allocated: int = 0  # buffers created (preallocation plus growth on exhaustion)
+    reused: int = 0
+    unpooled: int = 0  # payloads other than frame_size (e.g. small uint8 sequences), copied as they are
+    double_released: int = 0  # release() of a buffer already free, ignored
+
+
+class BufferPool:
+    # Fixed-size image buffers for one stream, preallocated from its BufferInfo.
+    # Receivers acquire a buffer per frame; consumers hand it back with release() once done.
+    # acquire() runs on receiver threads and release() on consumers, so the free list is locked.
+    # Handed-out buffers are tracked weakly: one that is never released (dropped or evicted frames)
+    # is garbage collected with its frame, and at most `count` buffers are kept free.
+    def __init__(self, frame_size: int, count: int = 8, shape: Optional[Tuple[int, ...]] = None):
+        self.frame_size = int(frame_size)
+        self.shape = shape
+        self.capacity = max(0, count)
+        self.stats = BufferPoolStats()
+        self._owned: "weakref.WeakValueDictionary[int, np.ndarray]" = weakref.WeakValueDictionary()
+        self._free: Deque[np.ndarray] = deque()
+        self._free_ids: Set[int] = set()  # ids of the buffers in _free, to ignore repeated releases
+        self._lock = threading.Lock()
+        for _ in range(self.capacity):
+            buf = self._allocate()
+            self._free.append(buf)
+            self._free_ids.add(id(buf))
+
+    @staticmethod
+    def from_buffer_info(info: BufferInfo, count: int = 8) -> Optional["BufferPool"]:
+        if not info.is_fixed_size or int(info.frame_size) == 0:
+            return None
+        shape = None
+        if info.height and info.stride and int(info.height) * int(info.stride) == int(info.frame_size):
+            shape = (int(info.height), int(info.stride))  # rows of stride bytes
+        return BufferPool(int(info.frame_size), count, shape)
+
+    def _allocate(self) -> np.ndarray:
+        buf = np.empty(self.frame_size, dtype=np.uint8)
+        self._owned[id(buf)] = buf
+        self.stats.allocated += 1
+        return buf
+
+    def acquire(self) -> np.ndarray:
+        with self._lock:
+            if not self._free:
+                return self._allocate()
+            buf = self._free.pop()
+            self._free_ids.discard(id(buf))
+            self.stats.reused += 1
+            return buf
+
+    def release(self, array: Any) -> None:
+        # Accepts the pooled buffer or any view of it (e.g. the array returned by fill())
+        base = array
+        while isinstance(base, np.ndarray) and isinstance(base.base, np.ndarray):
+            base = base.base
+        if not isinstance(base, np.ndarray) or self._owned.get(id(base)) is not base:
+            return
+        with self._lock:
+            if id(base) in self._free_ids:
+                self.stats.double_released += 1
+            elif len(self._free) < self.capacity:
+                self._free.append(base)
+                self._free_ids.add(id(base))
+
+    def fill(self, data: Any) -> np.ndarray:
+        # Copy data (bytes, memoryview, list of ints or array) into a pooled buffer. Usable as the
+        # blob callback of decode_raw_message, which calls it for every uint8 sequence: only
+        # frame_size payloads (the image) take a buffer, anything else gets a plain copy.
+        if isinstance(data, (bytes, bytearray, memoryview)):
+            data = np.frombuffer(data, dtype=np.uint8)
+        if len(data) != self.frame_size:
+            with self._lock:
+                self.stats.unpooled += 1
+            return np.array(data, dtype=np.uint8)
+        buf = self.acquire()
+        buf[:] = data
+        return buf
+
+    def as_image(self, array: np.ndarray) -> np.ndarray:
+        # 2D (height, stride) view of a filled buffer when the descriptor geometry is known
+        if self.shape is None or array.size != self.frame_size:
+            return array
+        return array.reshape(self.shape)
+
+    def available(self) -> int:
+        return len(self._free)
@@ -0,0 +1,102 @@
+from __future__ import annotations
+import threading
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+from .frames import GroupOfFrames
+
+
+@dataclass
+class _ClockModel:
+    # Exponentially weighted sums for a linear fit residual = offset + drift * t
+    t0: int = 0
+    sw: float = 0.0
+    sx: float = 0.0
+    sr: float = 0.0
+    sxx: float = 0.0
+    sxr: float = 0.0
+    offset_ns: float = 0.0
+    drift: float = 0.0  # ns of skew per second
+
+    def update(self, ts: int, residual_ns: float, forgetting: float) -> None:
+        if self.sw == 0.0:
+            self.t0 = ts
+        x = (ts - self.t0) / 1e9
+        self.sw = forgetting * self.sw + 1.0
+        self.sx = forgetting * self.sx + x
+        self.sr = forgetting * self.sr + residual_ns
+        self.sxx = forgetting * self.sxx + x * x
+        self.sxr = forgetting * self.sxr + x * residual_ns
+        denom = self.sw * self.sxx - self.sx * self.sx
+        # Fall back to a plain mean until there is enough spread in time to fit a slope
+        if abs(denom) > 1e-9:
+            self.drift = (self.sw * self.sxr - self.sx * self.sr) / denom
+        else:
+            self.drift = 0.0
+        self.offset_ns = (self.sr - self.drift * self.sx) / self.sw
+
+    def predict(self, ts: int) -> float:
+        if self.sw == 0.0:
+            return 0.0
+        return self.offset_ns + self.drift * ((ts - self.t0) / 1e9)
+
+
+def offset_sign_plausible(device_ts: int, offset_ns: int, host_ts: int) -> bool:
+    # Static sensor offsets map device to host time: host = device + offset. False when subtracting
+    # the offset lands closer to the host clock, i.e. the sensor reports the inverse convention.
+    return abs(host_ts - (device_ts + offset_ns)) <= abs(host_ts - (device_ts - offset_ns))
+
+
+class ClockOffsetEstimator:
+    # Online estimate of the residual offset/drift of every stream relative to a reference stream.
+    # observe() learns from emitted groups; correct() is applied by receivers as frames are built.
+    # Pass the same instance to the receivers and, as clock_estimator, to the grouper
+    # (TimestampGrouper, GrouperSink or Dataflow.add_grouper), which calls observe(); without
+    # that the learned correction stays zero.
+    # Observed timestamps are already corrected, so the applied correction is added back to
+    # recover the raw residual (the model changes slowly, so re-predicting is accurate enough).
+    def __init__(self, reference_stream_id: Optional[int] = None, forgetting: float = 0.98, max_residual_ms: int = 100):
+        self.reference_stream_id = reference_stream_id
+        self.forgetting = float(forgetting)
+        self.max_residual_ns = int(max_residual_ms) * 1_000_000
+        self._models: Dict[int, _ClockModel] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, group: GroupOfFrames) -> None:
+        frames = {f.get_stream_id(): f for f in group.get_frames().values() if f.is_complete()}
+        if not frames:
+            return
+        with self._lock:
+            if self.reference_stream_id is None:
+                self.reference_stream_id = min(frames)
+            ref = frames.get(self.reference_stream_id)
+            if ref is None:
+                return
+            ref_ts = ref.get_timestamp()
+            for stream_id, frame in frames.items():
+                if stream_id == self.reference_stream_id:
+                    continue
+                model = self._models.setdefault(stream_id, _ClockModel())
+                ts = frame.get_timestamp()
+                residual = (ts - ref_ts) + model.predict(ts)
+                # Ignore implausible pairings instead of letting them skew the fit
+                if abs(residual) > self.max_residual_ns:
+                    continue
+                model.update(ts, residual, self.forgetting)
+
+    def correct(self, stream_id: int, timestamp: int) -> int:
+        with self._lock:
+            model = self._models.get(stream_id)
+            if model is None:
+                return int(timestamp)
+            return int(round(timestamp - model.predict(timestamp)))
+
+    def get_offset_ns(self, stream_id: int) -> float:
+        with self._lock:
+            model = self._models.get(stream_id)
+            return 0.0 if model is None else model.offset_ns
+
+    def get_drift(self, stream_id: int) -> float:
+        with self._lock:
+            model = self._models.get(stream_id)
+            return 0.0 if model is None else model.drift
@@ -1,15 +1,106 @@
 from __future__ import annotations
+import logging
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass, field
-from typing import Iterable, List, Optional, Dict, Any
+from typing import Callable, Iterable, List, Optional, Dict, Any, Deque
 
-from .frames import Frame, GroupOfFrames, TimestampMatcherType, FrameAnnotation, timestamp_grouper as _timestamp_grouper
+from .frames import Frame, GroupOfFrames, GrouperStats, TimestampMatcherType, FrameAnnotation, TimestampGrouper, timestamp_grouper as _timestamp_grouper
+from ..serialization.error import MessageError
+
+log = logging.getLogger(__name__)
 
 
 # Synchronous wrapper approximating Rust dataflow::timestamp_grouper
 # In Python, we operate on in-memory iterables and return a list of groups.
 
-def timestamp_grouper(frames: Iterable[Frame], worker_channels: List[str], matcher: Optional[TimestampMatcherType] = None) -> List[GroupOfFrames]:
-    return _timestamp_grouper(frames, worker_channels, matcher)
+def timestamp_grouper(
+    frames: Iterable[Frame],
+    worker_channels: List[str],
+    matcher: Optional[TimestampMatcherType] = None,
+    max_pending_groups: Optional[int] = None,
+    max_age_ms: Optional[int] = None,
+) -> List[GroupOfFrames]:
+    return _timestamp_grouper(frames, worker_channels, matcher, max_pending_groups, max_age_ms)
+
+
+def _dispatch(sink: Any, item: Any) -> None:
+    if hasattr(sink, "put") and callable(getattr(sink, "put")):
+        sink.put(item)
+    elif callable(sink):
+        sink(item)
+    elif isinstance(sink, list):
+        sink.append(item)
+
+
+class _GrouperSinkSender:
+    def __init__(self, sink: "GrouperSink", worker_id: int):
+        self._sink = sink
+        self._worker_id = worker_id
+
+    def put(self, frame: Frame) -> None:
+        self._sink.submit(self._worker_id, frame)
+
+    def __call__(self, frame: Frame) -> None:
+        self._sink.submit(self._worker_id, frame)
+
+
+class GrouperSink:
+    # Online timestamp grouper fed directly by the receiver threads (see worker_senders()).
+    # Each worker appends to its own inbox without locking; whichever thread wins a non-blocking
+    # try-lock drains all inboxes into the grouper, so receivers never wait on each other.
+    # Completed groups go to output (queue-like with put(), callable, or list).
+    def __init__(
+        self,
+        worker_channels: List[str],
+        num_workers: int,
+        output: Any,
+        matcher: Optional[TimestampMatcherType] = None,
+        **grouper_options: Any,
+    ):
+        self.grouper = TimestampGrouper(worker_channels, matcher, **grouper_options)
+        self.output = output
+        self._inboxes: List[Deque[Frame]] = [deque() for _ in range(max(1, num_workers))]
+        self._lock = threading.Lock()
+
+    def worker_senders(self) -> List[Any]:
+        return [_GrouperSinkSender(self, i) for i in range(len(self._inboxes))]
+
+    def submit(self, worker_id: int, frame: Frame) -> None:
+        self._inboxes[worker_id].append(frame)
+        self._drain()
+
+    def poll(self) -> None:
+        # Emit groups past their deadline while no frames arrive
+        self._drain()
+
+    def _drain(self) -> None:
+        while True:
+            if not self._lock.acquire(blocking=False):
+                return  # the current holder re-checks the inboxes before leaving
+            try:
+                for inbox in self._inboxes:
+                    while inbox:
+                        for group in self.grouper.push(inbox.popleft()):
+                            _dispatch(self.output, group)
+                for group in self.grouper.flush_expired():
+                    _dispatch(self.output, group)
+            finally:
+                self._lock.release()
+            if not any(self._inboxes):
+                return
+
+    def get_stats(self) -> GrouperStats:
+        with self._lock:
+            return GrouperStats(
+                emitted_groups=self.grouper.stats.emitted_groups,
+                partial_groups=self.grouper.stats.partial_groups,
+                evicted_groups=self.grouper.stats.evicted_groups,
+                orphaned_frames=dict(self.grouper.stats.orphaned_frames),
+            )
 
 
 @dataclass
@@ -20,6 +111,8 @@ class StreamConfig:
     sensor_name: Optional[str] = None
     descriptor: Optional[Any] = None  # StreamDescriptorMessage
     annotations: Dict[str, FrameAnnotation] = field(default_factory=dict)
+    timestamp_offset_ns: int = 0  # added to message timestamps (ns): host time = device time + offset
+    buffer_pool: Optional[Any] = None  # BufferPool for fixed-size streams (see start_all_receivers)
 
     @staticmethod
     def new(stream_id: int, stream_name: str, stream_topic: str) -> "StreamConfig":
@@ -27,3 +120,211 @@ class StreamConfig:
 
     def add_annotation(self, key: str, value: FrameAnnotation) -> None:
         self.annotations[key] = value
+
+
+# Dataflow runtime: a linear chain of stages connected by bounded queues, mirroring the Rust
+# tcnart dataflow. A full queue blocks the producer (backpressure up to the receiver threads).
+# Each stage runs `workers` threads; with executor="process" the threads hand items to a process
+# pool (fn and items must be picklable). With flat=True, fn returns an iterable of outputs
+# (e.g. TimestampGrouper.push); otherwise a single output, where None means "nothing to forward".
+# put() numbers every item; a stage forwards the outputs of input n only after those of input
+# n - 1, so parallel stages never reorder the stream (a preempted worker holds back the others).
+
+_STOP = object()
+DEFAULT_POLL_INTERVAL_S = 0.01  # how often an idle grouper stage emits groups past their deadline
+
+
+@dataclass
+class StageStats:
+    items_in: int = 0
+    items_out: int = 0
+    errors: int = 0
+    busy_ns: int = 0
+    queue_depth: int = 0
+    started_ns: int = 0
+
+    def throughput(self) -> float:
+        # Items processed per second since the stage started
+        elapsed = (time.monotonic_ns() - self.started_ns) / 1e9 if self.started_ns else 0.0
+        return self.items_in / elapsed if elapsed > 0 else 0.0
+
+    def utilisation(self, workers: int = 1) -> float:
+        elapsed = time.monotonic_ns() - self.started_ns if self.started_ns else 0
+        return self.busy_ns / (elapsed * max(1, workers)) if elapsed > 0 else 0.0
+
+
+@dataclass
+class Stage:
+    name: str
+    fn: Callable[[Any], Any]
+    workers: int = 1
+    executor: str = "thread"  # "thread" or "process"
+    flat: bool = False
+    queue_size: int = 64
+    on_close: Optional[Callable[[], Iterable[Any]]] = None  # outputs flushed at end of stream
+    on_idle: Optional[Callable[[], Iterable[Any]]] = None  # outputs polled while the queue is empty
+    poll_interval_s: float = DEFAULT_POLL_INTERVAL_S
+    stats: StageStats = field(default_factory=StageStats)
+    _queue: Optional["queue.Queue[Any]"] = None
+    _threads: List[threading.Thread] = field(default_factory=list)
+    _pool: Optional[Any] = None
+    _lock: threading.Lock = field(default_factory=threading.Lock)
+    _running: int = 0
+    _turn: threading.Condition = field(default_factory=threading.Condition)
+    _next_in: int = 0  # sequence number of the next input whose outputs may be forwarded
+    _next_out: int = 0  # sequence number given to the next output
+
+
+class Dataflow:
+    def __init__(self, queue_size: int = 64):
+        self.queue_size = queue_size
+        self.stages: List[Stage] = []
+        self._started = False
+        self._put_lock = threading.Lock()
+        self._next_seq = 0
+
+    def add_stage(
+        self,
+        name: str,
+        fn: Callable[[Any], Any],
+        workers: int = 1,
+        executor: str = "thread",
+        flat: bool = False,
+        queue_size: Optional[int] = None,
+        on_close: Optional[Callable[[], Iterable[Any]]] = None,
+        on_idle: Optional[Callable[[], Iterable[Any]]] = None,
+        poll_interval_s: float = DEFAULT_POLL_INTERVAL_S,
+    ) -> "Dataflow":
+        if self._started:
+            raise MessageError(MessageError.TASK_ERROR, "Cannot add stages to a running dataflow")
+        if executor not in ("thread", "process"):
+            raise MessageError(MessageError.TASK_ERROR, f"Unknown executor: {executor}")
+        self.stages.append(Stage(
+            name=name, fn=fn, workers=max(1, workers), executor=executor, flat=flat,
+            queue_size=self.queue_size if queue_size is None else queue_size,
+            on_close=on_close, on_idle=on_idle, poll_interval_s=poll_interval_s,
+        ))
+        return self
+
+    def add_grouper(self, worker_channels: List[str], matcher: Optional[TimestampMatcherType] = None, name: str = "grouper", **grouper_options: Any) -> TimestampGrouper:
+        # Grouping is stateful, so it always runs on a single thread. Stages keep put() order, so
+        # frames arrive as they were submitted; while none arrive, groups past their deadline are
+        # still emitted every DEFAULT_POLL_INTERVAL_S.
+        grouper = TimestampGrouper(worker_channels, matcher, **grouper_options)
+        self.add_stage(
+            name, grouper.push, workers=1, flat=True,
+            on_close=grouper.flush_reorder_buffers, on_idle=grouper.flush_expired,
+        )
+        return grouper
+
+    def start(self) -> "Dataflow":
+        for stage in self.stages:
+            stage._queue = queue.Queue(maxsize=stage.queue_size)
+        for index, stage in enumerate(self.stages):
+            nxt = self.stages[index + 1] if index + 1 < len(self.stages) else None
+            if stage.executor == "process":
+                stage._pool = ProcessPoolExecutor(max_workers=stage.workers)
+            stage.stats.started_ns = time.monotonic_ns()
+            stage._running = stage.workers
+            for i in range(stage.workers):
+                t = threading.Thread(target=self._run_stage, args=(stage, nxt), name=f"{stage.name}-{i}", daemon=True)
+                t.start()
+                stage._threads.append(t)
+        self._started = True
+        return self
+
+    def put(self, item: Any) -> None:
+        # Blocks while the first stage's queue is full
+        with self._put_lock:
+            self.stages[0]._queue.put((self._next_seq, item))  # type: ignore[union-attr]
+            self._next_seq += 1
+
+    def worker_senders(self, num_workers: int) -> List[Any]:
+        # Drop-in senders for start_all_receivers
+        return [self for _ in range(max(1, num_workers))]
+
+    def close(self) -> None:
+        # Stop after everything already queued has passed through all stages
+        if self.stages:
+            for _ in range(self.stages[0].workers):
+                self.stages[0]._queue.put(_STOP)  # type: ignore[union-attr]
+
+    def join(self, timeout: Optional[float] = None) -> None:
+        for stage in self.stages:
+            for t in stage._threads:
+                t.join(timeout)
+            if stage._pool is not None:
+                stage._pool.shutdown(wait=True)
+
+    def stats(self) -> Dict[str, StageStats]:
+        for stage in self.stages:
+            if stage._queue is not None:
+                stage.stats.queue_depth = stage._queue.qsize()
+        return {stage.name: stage.stats for stage in self.stages}
+
+    def _run_stage(self, stage: Stage, nxt: Optional[Stage]) -> None:
+        q = stage._queue
+        while True:
+            if stage.on_idle is not None:
+                try:
+                    entry = q.get(timeout=stage.poll_interval_s)  # type: ignore[union-attr]
+                except queue.Empty:
+                    self._forward(stage, nxt, None, self._call(stage, stage.on_idle, flat=True))
+                    continue
+            else:
+                entry = q.get()  # type: ignore[union-attr]
+            if entry is _STOP:
+                break
+            seq, item = entry
+            t0 = time.monotonic_ns()
+            if stage._pool is not None:
+                outputs = self._call(stage, lambda: stage._pool.submit(stage.fn, item).result(), stage.flat)
+            else:
+                outputs = self._call(stage, lambda: stage.fn(item), stage.flat)
+            busy_ns = time.monotonic_ns() - t0
+            self._forward(stage, nxt, seq, outputs)
+            with stage._lock:
+                stage.stats.items_in += 1
+                stage.stats.busy_ns += busy_ns
+
+        # Last worker of this stage hands the stop signal on to the next stage
+        with stage._lock:
+            stage._running -= 1
+            last = stage._running == 0
+        if last and stage.on_close is not None:
+            self._forward(stage, nxt, None, list(stage.on_close()))
+        if last and nxt is not None:
+            for _ in range(nxt.workers):
+                nxt._queue.put(_STOP)  # type: ignore[union-attr]
+
+    @staticmethod
+    def _call(stage: Stage, fn: Callable[[], Any], flat: bool) -> List[Any]:
+        # Outputs of one call; errors are logged and counted, leaving no outputs
+        try:
+            result = fn()
+            if result is None:
+                return []
+            return list(result) if flat else [result]
+        except Exception as e:
+            log.exception(e)
+            with stage._lock:
+                stage.stats.errors += 1
+            return []
+
+    @staticmethod
+    def _forward(stage: Stage, nxt: Optional[Stage], seq: Optional[int], outputs: List[Any]) -> None:
+        # Waits for the turn of input seq (None: not tied to an input), then numbers the outputs
+        # and hands them to the next stage
+        with stage._turn:
+            while seq is not None and stage._next_in != seq:
+                stage._turn.wait()
+            for out in outputs:
+                if nxt is not None:
+                    nxt._queue.put((stage._next_out, out))  # type: ignore[union-attr]
+                stage._next_out += 1
+            if seq is not None:
+                stage._next_in += 1
+                stage._turn.notify_all()
+        if outputs:
+            with stage._lock:
+                stage.stats.items_out += len(outputs)
@@ -19,6 +19,22 @@ from .semantic_type.model import (
     TransformFormatTypes,
     TransformDetailTypes,
 )
+from .semantic_type import register_semantic_types
+
+
+# Shared by the *_types classes below; their predefined constants are computed while the class
+# body runs, before the class name exists
+def _create_base_id(
+    scalar_type: ScalarType,
+    cardinality_type: CardinalityType,
+    container_type: ContainerType,
+    memory_representation_type: MemoryRepresentationType,
+) -> IdentifierStorageType:
+    st_value = scalar_type.value << constants.SCALAR_TYPE_OFFSET
+    cat_value = cardinality_type.value << constants.CARDINALITY_TYPE_OFFSET
+    ct_value = container_type.value << constants.CONTAINER_TYPE_OFFSET
+    mrt_value = memory_representation_type.value << constants.MEMORY_REPRESENTATION_TYPE_OFFSET
+    return (st_value | cat_value | ct_value | mrt_value)
 
 
 # Image types
@@ -36,7 +52,7 @@ class image_types:
         else:
             base_mrt = MemoryRepresentationType.Compressed
 
-        base_id = image_types._create_base_id(
+        base_id = _create_base_id(
             scalar_type, CardinalityType.Fixed, ContainerType.Array2D, base_mrt
         )
         return (
@@ -49,18 +65,7 @@ class image_types:
             | (0 << constants.CUSTOM_MASK_TYPE_OFFSET)
         )
 
-    @staticmethod
-    def _create_base_id(
-        scalar_type: ScalarType,
-        cardinality_type: CardinalityType,
-        container_type: ContainerType,
-        memory_representation_type: MemoryRepresentationType,
-    ) -> IdentifierStorageType:
-        st_value = scalar_type.value << constants.SCALAR_TYPE_OFFSET
-        cat_value = cardinality_type.value << constants.CARDINALITY_TYPE_OFFSET
-        ct_value = container_type.value << constants.CONTAINER_TYPE_OFFSET
-        mrt_value = memory_representation_type.value << constants.MEMORY_REPRESENTATION_TYPE_OFFSET
-        return (st_value | cat_value | ct_value | mrt_value)
+    _create_base_id = staticmethod(_create_base_id)
 
     # Predefined constants mirroring Rust
     GENERIC_IMAGE_2D: Final[int] = create_image_type.__func__(ScalarType.None_, ImageCompressionTypes.None_, ImageFormatTypes.None_)
@@ -98,7 +103,7 @@ class geometry_types:
         else:
             base_mrt = MemoryRepresentationType.Compressed
 
-        base_id = geometry_types._create_base_id(
+        base_id = _create_base_id(
             scalar_type, CardinalityType.Fixed, ContainerType.Array1D, base_mrt
         )
         return (
@@ -111,18 +116,7 @@ class geometry_types:
             | (attributes << constants.CUSTOM_MASK_TYPE_OFFSET)
         )
 
-    @staticmethod
-    def _create_base_id(
-        scalar_type: ScalarType,
-        cardinality_type: CardinalityType,
-        container_type: ContainerType,
-        memory_representation_type: MemoryRepresentationType,
-    ) -> IdentifierStorageType:
-        st_value = scalar_type.value << constants.SCALAR_TYPE_OFFSET
-        cat_value = cardinality_type.value << constants.CARDINALITY_TYPE_OFFSET
-        ct_value = container_type.value << constants.CONTAINER_TYPE_OFFSET
-        mrt_value = memory_representation_type.value << constants.MEMORY_REPRESENTATION_TYPE_OFFSET
-        return (st_value | cat_value | ct_value | mrt_value)
+    _create_base_id = staticmethod(_create_base_id)
 
     # Predefined geometry types
     POINT_CLOUD_VERTEX_NORMAL: Final[int] = create_geometry_type.__func__(
@@ -185,7 +179,7 @@ class transform_types:
         format_type: TransformFormatTypes,
         detail_type: TransformDetailTypes,
     ) -> IdentifierStorageType:
-        base_id = transform_types._create_base_id(
+        base_id = _create_base_id(
             scalar_type, cardinality_type, ContainerType.Array1D, MemoryRepresentationType.Raw
         )
         return (
@@ -203,7 +197,7 @@ class transform_types:
         scalar_type: ScalarType,
         format_type: TransformFormatTypes,
     ) -> IdentifierStorageType:
-        base_id = transform_types._create_base_id(
+        base_id = _create_base_id(
             scalar_type, CardinalityType.Fixed, ContainerType.Scalar, MemoryRepresentationType.Raw
         )
         return (
@@ -216,18 +210,7 @@ class transform_types:
             | (0 << constants.CUSTOM_MASK_TYPE_OFFSET)
         )
 
-    @staticmethod
-    def _create_base_id(
-        scalar_type: ScalarType,
-        cardinality_type: CardinalityType,
-        container_type: ContainerType,
-        memory_representation_type: MemoryRepresentationType,
-    ) -> IdentifierStorageType:
-        st_value = scalar_type.value << constants.SCALAR_TYPE_OFFSET
-        cat_value = cardinality_type.value << constants.CARDINALITY_TYPE_OFFSET
-        ct_value = container_type.value << constants.CONTAINER_TYPE_OFFSET
-        mrt_value = memory_representation_type.value << constants.MEMORY_REPRESENTATION_TYPE_OFFSET
-        return (st_value | cat_value | ct_value | mrt_value)
+    _create_base_id = staticmethod(_create_base_id)
 
     # Predefined transform types
     HUMAN_POSE_TRACKING: Final[int] = create_transform_type.__func__(
@@ -237,3 +220,12 @@ class transform_types:
     IMU_SENSOR: Final[int] = create_imu_sensor_type.__func__(
         ScalarType.Float32, TransformFormatTypes.Acceleration
     )
+
+
+# Pre-parse every predefined identifier so parse_semantic_type() on them is a dict lookup
+register_semantic_types(
+    value
+    for types in (image_types, geometry_types, transform_types)
+    for name, value in vars(types).items()
+    if name.isupper()
+)
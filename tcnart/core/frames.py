@@ -1,6 +1,11 @@
 from __future__ import annotations
+import bisect
+import time
+from collections import deque
 from dataclasses import dataclass, field
-from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Any
+from typing import Callable, Deque, Dict, Iterable, Iterator, List, Optional, Tuple, Any
+
+import numpy as np
 
 from ..schema.messages.common import InvalidMessage
 from ..schema.types.common import BufferInfo
@@ -38,21 +43,49 @@ class FrameAnnotation:
         return FrameAnnotation("DistortionCoefficients", list(coeffs))
 
 
-@dataclass
+class SharedAnnotations(dict):
+    # Read-only annotation map shared by reference between all frames of a stream.
+    # Frame.add_annotation copies it into a private dict on first write.
+    def _readonly(self, *args: Any, **kwargs: Any) -> Any:
+        raise TypeError("SharedAnnotations is read-only; use Frame.add_annotation")
+
+    __setitem__ = __delitem__ = __ior__ = _readonly
+    clear = pop = popitem = setdefault = update = _readonly
+
+    def __reduce__(self) -> Any:
+        return (SharedAnnotations, (dict(self),))
+
+
+_NO_ANNOTATIONS = SharedAnnotations()
+
+
+@dataclass(slots=True)
 class Frame:
     timestamp: int = 0
     semantic_type: int = 0  # Using identifier u64 equivalent
     stream_id: int = 0
     data: Any = field(default_factory=InvalidMessage)
-    annotations: Dict[str, FrameAnnotation] = field(default_factory=dict)
+    annotations: Dict[str, FrameAnnotation] = field(default_factory=lambda: _NO_ANNOTATIONS)
 
     @staticmethod
     def new() -> "Frame":
         return Frame()
 
     @staticmethod
-    def create(timestamp: int, semantic_type: int, stream_id: int, data: Any) -> "Frame":
-        return Frame(timestamp=timestamp, semantic_type=semantic_type, stream_id=stream_id, data=data)
+    def create(
+        timestamp: int,
+        semantic_type: int,
+        stream_id: int,
+        data: Any,
+        annotations: Optional[SharedAnnotations] = None,
+    ) -> "Frame":
+        return Frame(
+            timestamp=timestamp,
+            semantic_type=semantic_type,
+            stream_id=stream_id,
+            data=data,
+            annotations=_NO_ANNOTATIONS if annotations is None else annotations,
+        )
 
     def is_complete(self) -> bool:
         return not isinstance(self.data, InvalidMessage) and self.timestamp != 0
@@ -78,6 +111,8 @@ class Frame:
 
     # Annotations
     def add_annotation(self, key: str, value: FrameAnnotation) -> None:
+        if type(self.annotations) is SharedAnnotations:
+            self.annotations = dict(self.annotations)  # copy-on-write
         self.annotations[key] = value
 
     def get_annotation(self, key: str) -> Optional[FrameAnnotation]:
@@ -135,10 +170,19 @@ class TimestampMatcherWindow(TimestampMatcher):
         return True
 
 
+@dataclass
+class TimestampMatcherNearest(TimestampMatcherWindow):
+    # Same acceptance as window matching, but the grouper assigns a frame to the group with the
+    # closest reference timestamp and lets a better fitting frame displace a worse one.
+    def score(self, timestamp: int, ref_timestamp: int) -> int:
+        return abs(int(timestamp) - int(ref_timestamp))
+
+
 @dataclass
 class TimestampMatcherType(TimestampMatcher):
     exact: Optional[TimestampMatcherExact] = None
     window: Optional[TimestampMatcherWindow] = None
+    nearest: Optional[TimestampMatcherNearest] = None
 
     @staticmethod
     def new_exact() -> "TimestampMatcherType":
@@ -148,22 +192,31 @@ class TimestampMatcherType(TimestampMatcher):
     def new_window(max_offset_ms: int) -> "TimestampMatcherType":
         return TimestampMatcherType(window=TimestampMatcherWindow(max_offset_ms=max_offset_ms))
 
+    @staticmethod
+    def new_nearest(max_offset_ms: int) -> "TimestampMatcherType":
+        return TimestampMatcherType(nearest=TimestampMatcherNearest(max_offset_ms=max_offset_ms))
+
     def get_exact(self) -> Optional[TimestampMatcherExact]:
         return self.exact
 
     def get_window(self) -> Optional[TimestampMatcherWindow]:
         return self.window
 
+    def get_nearest(self) -> Optional[TimestampMatcherNearest]:
+        return self.nearest
+
     def check_timestamp(self, timestamp: int, timestamps: Iterable[int]) -> bool:
         if self.exact is not None:
             return self.exact.check_timestamp(timestamp, timestamps)
         if self.window is not None:
             return self.window.check_timestamp(timestamp, timestamps)
+        if self.nearest is not None:
+            return self.nearest.check_timestamp(timestamp, timestamps)
         # Default to exact if none provided
         return TimestampMatcherExact().check_timestamp(timestamp, timestamps)
 
 
-@dataclass
+@dataclass(slots=True)
 class GroupOfFrames:
     ref_timestamp: int = 0
     frames: Dict[str, Frame] = field(default_factory=dict)
@@ -194,10 +247,11 @@ class GroupOfFrames:
         return max_ts
 
     def min_timestamp(self) -> int:
+        # Smallest timestamp among filled channels (0 if the group holds no frame)
         min_ts = 0
         for _, f in self.frames.items():
             ts = f.get_timestamp()
-            if ts < min_ts:
+            if ts != 0 and (min_ts == 0 or ts < min_ts):
                 min_ts = ts
         return min_ts
 
@@ -205,48 +259,478 @@ class GroupOfFrames:
         # All channels must have a complete frame
         return all(f.is_complete() for f in self.frames.values())
 
+    def missing_channels(self) -> List[str]:
+        # Channels still holding the empty placeholder frame (set on partial groups emitted at a deadline)
+        return [ch for ch, f in self.frames.items() if not f.is_complete()]
 
-# Synchronous approximation of Rust dataflow timestamp_grouper
-# This function groups an iterable of Frame into GroupOfFrames given the channel order.
 
-def timestamp_grouper(frames: Iterable[Frame], worker_channels: List[str], matcher: Optional[TimestampMatcherType] = None) -> List[GroupOfFrames]:
-    if matcher is None:
-        matcher = TimestampMatcherType.new_exact()
+@dataclass
+class ReorderStats:
+    reordered_frames: int = 0  # frames that overtook at least one buffered frame
+    late_frames: int = 0  # frames older than what was already released; passed through unordered
+    expired_frames: int = 0  # frames released because one of them was held longer than max_hold_ms
+    max_depth: int = 0
+    depth_histogram: Dict[int, int] = field(default_factory=dict)  # reorder depth -> count
+
+
+class ReorderBuffer:
+    # Small per-stream jitter buffer: holds up to max_frames frames, or frames younger than
+    # max_delay_ms relative to the newest timestamp of the stream, and releases them in order.
+    # max_hold_ms bounds the wall-clock time a frame is held, so a stalled stream still releases
+    # its last frames (on the next push or release_expired()).
+    def __init__(
+        self,
+        max_frames: Optional[int] = None,
+        max_delay_ms: Optional[int] = None,
+        max_hold_ms: Optional[int] = None,
+        clock: Callable[[], int] = time.monotonic_ns,
+    ):
+        self.max_frames = max_frames
+        self.max_delay_ns = None if max_delay_ms is None else int(max_delay_ms) * 1_000_000
+        self.max_hold_ns = None if max_hold_ms is None else int(max_hold_ms) * 1_000_000
+        self.stats = ReorderStats()
+        self._clock = clock
+        self._timestamps: List[int] = []
+        self._frames: List[Frame] = []
+        self._arrivals: List[int] = []  # wall clock arrival, in timestamp order like _frames
+        self._next_expiry: Optional[int] = None  # wall clock at which the longest held frame expires
+        self._released_ts = 0
+
+    def push(self, frame: Frame) -> List[Frame]:
+        ts = frame.get_timestamp()
+        if ts < self._released_ts:
+            self.stats.late_frames += 1
+            return [frame]
+        pos = bisect.bisect_right(self._timestamps, ts)
+        depth = len(self._timestamps) - pos
+        if depth > 0:
+            self.stats.reordered_frames += 1
+            self.stats.max_depth = max(self.stats.max_depth, depth)
+            self.stats.depth_histogram[depth] = self.stats.depth_histogram.get(depth, 0) + 1
+        self._timestamps.insert(pos, ts)
+        self._frames.insert(pos, frame)
+        if self.max_hold_ns is not None:
+            now = self._clock()
+            self._arrivals.insert(pos, now)
+            if self._next_expiry is None:
+                self._next_expiry = now + self.max_hold_ns
+
+        count = 0
+        if self.max_frames is not None:
+            count = max(count, len(self._frames) - self.max_frames)
+        if self.max_delay_ns is not None:
+            count = max(count, bisect.bisect_right(self._timestamps, self._timestamps[-1] - self.max_delay_ns))
+        return self._release(max(count, self._expired_count()))
+
+    def release_expired(self) -> List[Frame]:
+        return self._release(self._expired_count())
+
+    def next_expiry(self) -> Optional[int]:
+        # Wall clock time from which release_expired() releases frames; None while nothing is held
+        return self._next_expiry
+
+    def _expired_count(self) -> int:
+        # Frames up to the last one held past max_hold_ms; earlier ones go with it to keep the order
+        if self._next_expiry is None:
+            return 0
+        now = self._clock()
+        if now < self._next_expiry:
+            return 0
+        cutoff = now - self.max_hold_ns
+        count = 0
+        for i, arrived in enumerate(self._arrivals):
+            if arrived <= cutoff:
+                count = i + 1
+        if count:
+            self.stats.expired_frames += count
+        return count
+
+    def _release(self, count: int) -> List[Frame]:
+        if count <= 0:
+            return []
+        out = self._frames[:count]
+        self._released_ts = self._timestamps[count - 1]
+        del self._frames[:count]
+        del self._timestamps[:count]
+        del self._arrivals[:count]
+        if self.max_hold_ns is not None:
+            self._next_expiry = min(self._arrivals) + self.max_hold_ns if self._arrivals else None
+        return out
+
+    def flush(self) -> List[Frame]:
+        return self._release(len(self._frames))
+
+
+_HISTOGRAM_BOUNDS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000)
 
-    unfinished: Dict[int, GroupOfFrames] = {}
-    out: List[GroupOfFrames] = []
 
-    for frame in frames:
-        if not frame.is_complete():
-            continue
-        ts = frame.get_timestamp()
-        stream_id = frame.get_stream_id()
-        channel = worker_channels[stream_id]
+@dataclass
+class Histogram:
+    # Millisecond histogram of nanosecond samples; the last bucket collects everything above 1 s
+    counts: List[int] = field(default_factory=lambda: [0] * (len(_HISTOGRAM_BOUNDS_MS) + 1))
+    count: int = 0
+    total_ns: int = 0
+    max_ns: int = 0
 
-        matched_ts = 0
-        for ref_ts, group in list(unfinished.items()):
-            if matcher.check_timestamp(ts, (f.get_timestamp() for f in group.get_frames().values())):
-                matched_ts = ref_ts
-                break
+    def record(self, value_ns: int) -> None:
+        self.counts[bisect.bisect_left(_HISTOGRAM_BOUNDS_MS, value_ns / 1e6)] += 1
+        self.count += 1
+        self.total_ns += value_ns
+        self.max_ns = max(self.max_ns, value_ns)
 
-        if matched_ts == 0:
-            unfinished[ts] = GroupOfFrames.new(ts, worker_channels)
-            matched_ts = ts
+    def mean_ms(self) -> float:
+        return self.total_ns / self.count / 1e6 if self.count else 0.0
 
-        group = unfinished[matched_ts]
-        group.set_frame(channel, frame)
+    def buckets(self) -> Dict[str, int]:
+        labels = [f"<={b}ms" for b in _HISTOGRAM_BOUNDS_MS] + [f">{_HISTOGRAM_BOUNDS_MS[-1]}ms"]
+        return dict(zip(labels, self.counts))
 
-        # Find completed groups and emit them in ascending timestamp order
-        completed = sorted([ref for ref, grp in unfinished.items() if grp.is_complete()])
-        latest_ts = 0
-        for ref in completed:
-            grp = unfinished.pop(ref)
-            out.append(grp)
-            latest_ts = max(latest_ts, grp.max_timestamp())
 
-        if latest_ts != 0:
-            # Retain only groups whose max_timestamp >= latest_ts
-            # XXX NOT SAVED!!
-            unfinished = {ref: grp for ref, grp in unfinished.items() if grp.max_timestamp() >= latest_ts}
+@dataclass
+class GrouperMetrics:
+    completion_latency: Histogram = field(default_factory=Histogram)  # first frame arrival -> emission (wall clock)
+    channel_lateness: Dict[str, Histogram] = field(default_factory=dict)  # group creation -> channel arrival
+    skew: Histogram = field(default_factory=Histogram)  # max - min timestamp of emitted groups
+    pending_groups: int = 0  # unfinished groups after the last push
+    max_pending_groups: int = 0
 
-    return out
+    def lateness(self, channel: str) -> Histogram:
+        hist = self.channel_lateness.get(channel)
+        if hist is None:
+            hist = self.channel_lateness[channel] = Histogram()
+        return hist
+
+
+@dataclass
+class GrouperStats:
+    emitted_groups: int = 0
+    partial_groups: int = 0
+    evicted_groups: int = 0
+    orphaned_frames: Dict[str, int] = field(default_factory=dict)  # frames dropped with evicted groups, per channel
+
+    def add_orphan(self, channel: str) -> None:
+        self.orphaned_frames[channel] = self.orphaned_frames.get(channel, 0) + 1
+
+
+# Synchronous approximation of Rust dataflow timestamp_grouper.
+# Unfinished groups are indexed by their sorted reference timestamps, so matching a frame
+# only inspects groups whose reference lies within the matcher window (O(log n) per frame).
+
+PARTIAL_HISTORY = 64
+
+
+class TimestampGrouper:
+    # max_pending_groups / max_age_ms bound the unfinished groups (age relative to the newest frame);
+    # both default to unbounded. Completing a group drops the unfinished groups entirely older than
+    # it, so input is expected roughly in timestamp order (see the reorder options below).
+    # With deadline_ms, a group still incomplete that long (wall clock) after its first frame
+    # is emitted as a partial group; see GroupOfFrames.missing_channels(). Frames arriving for one
+    # of the last PARTIAL_HISTORY partial groups are dropped as orphans instead of starting a new group.
+    # reorder_max_frames / reorder_max_delay_ms put a ReorderBuffer in front of every stream;
+    # reorder_max_hold_ms additionally bounds how long (wall clock) it holds a frame.
+    # collect_metrics enables GrouperMetrics (latency, lateness and skew histograms).
+    # clock_estimator (a ClockOffsetEstimator) observes every emitted group.
+    def __init__(
+        self,
+        worker_channels: List[str],
+        matcher: Optional[TimestampMatcherType] = None,
+        max_pending_groups: Optional[int] = None,
+        max_age_ms: Optional[int] = None,
+        deadline_ms: Optional[int] = None,
+        clock: Callable[[], int] = time.monotonic_ns,
+        reorder_max_frames: Optional[int] = None,
+        reorder_max_delay_ms: Optional[int] = None,
+        reorder_max_hold_ms: Optional[int] = None,
+        collect_metrics: bool = False,
+        clock_estimator: Optional[Any] = None,
+    ):
+        self.worker_channels = list(worker_channels)
+        self.matcher = matcher if matcher is not None else TimestampMatcherType.new_exact()
+        self.max_pending_groups = max_pending_groups
+        self.max_age_ns = None if max_age_ms is None else int(max_age_ms) * 1_000_000
+        self.stats = GrouperStats()
+        self._refs: List[int] = []  # sorted reference timestamps of unfinished groups
+        self._unfinished: Dict[int, GroupOfFrames] = {}
+        self._newest_ts = 0
+        self.deadline_ns = None if deadline_ms is None else int(deadline_ms) * 1_000_000
+        self._clock = clock
+        self._created: Deque[Tuple[int, int, GroupOfFrames]] = deque()  # (created_ns, ref, group) in creation order
+        self._reorder_options = (reorder_max_frames, reorder_max_delay_ms, reorder_max_hold_ms, clock)
+        self.reorder_buffers: Optional[Dict[int, ReorderBuffer]] = None
+        self._next_hold_expiry: Optional[int] = None  # earliest ReorderBuffer.next_expiry()
+        if reorder_max_frames is not None or reorder_max_delay_ms is not None or reorder_max_hold_ms is not None:
+            self.reorder_buffers = {}
+        self.metrics: Optional[GrouperMetrics] = GrouperMetrics() if collect_metrics else None
+        self._created_at: Dict[int, int] = {}  # ref -> wall clock creation, only with metrics
+        self.clock_estimator = clock_estimator
+        self._partial_refs: List[int] = []  # sorted refs of recently emitted partial groups
+        self._partials: Dict[int, Dict[str, int]] = {}  # ref -> timestamps of the channels it had
+
+    def _window_ns(self) -> int:
+        window = self.matcher.get_window() or self.matcher.get_nearest()
+        if window is not None:
+            return int(window.max_offset_ms) * 1_000_000
+        return 0
+
+    def _find_group(self, ts: int, channel: str) -> int:
+        # Every frame of a group lies within the window of its reference, so only those refs can match
+        window_ns = self._window_ns()
+        lo = bisect.bisect_left(self._refs, ts - window_ns)
+        hi = bisect.bisect_right(self._refs, ts + window_ns)
+        nearest = self.matcher.get_nearest()
+        best_ref = 0
+        best_score = 0
+        for ref in self._refs[lo:hi]:
+            group = self._unfinished[ref]
+            current = group.get_frames()[channel]
+            if current.is_complete():
+                # Nearest matching may take over a slot whose frame is further from the reference
+                if nearest is None or nearest.score(current.get_timestamp(), ref) <= nearest.score(ts, ref):
+                    continue
+            others = (f.get_timestamp() for ch, f in group.get_frames().items() if ch != channel)
+            if not self.matcher.check_timestamp(ts, others):
+                continue
+            if nearest is None:
+                return ref
+            score = nearest.score(ts, ref)
+            if best_ref == 0 or score < best_score:
+                best_ref, best_score = ref, score
+        return best_ref
+
+    def _remove(self, ref: int) -> GroupOfFrames:
+        del self._refs[bisect.bisect_left(self._refs, ref)]
+        self._created_at.pop(ref, None)
+        return self._unfinished.pop(ref)
+
+    def _record_emitted(self, ref: int, group: GroupOfFrames) -> None:
+        if self.clock_estimator is not None:
+            self.clock_estimator.observe(group)
+        if self.metrics is None:
+            return
+        created = self._created_at.get(ref)
+        if created is not None:
+            self.metrics.completion_latency.record(self._clock() - created)
+        self.metrics.skew.record(group.max_timestamp() - group.min_timestamp())
+
+    def _remember_partial(self, ref: int, group: GroupOfFrames) -> None:
+        # Only the timestamps are kept, not the frames
+        bisect.insort(self._partial_refs, ref)
+        self._partials[ref] = {ch: f.get_timestamp() for ch, f in group.get_frames().items() if f.is_complete()}
+        while len(self._partial_refs) > PARTIAL_HISTORY:
+            del self._partials[self._partial_refs.pop(0)]
+
+    def _is_late(self, ts: int, channel: str) -> bool:
+        # Whether the frame would have joined a group already emitted as partial
+        window_ns = self._window_ns()
+        lo = bisect.bisect_left(self._partial_refs, ts - window_ns)
+        hi = bisect.bisect_right(self._partial_refs, ts + window_ns)
+        for ref in self._partial_refs[lo:hi]:
+            timestamps = self._partials[ref]
+            if channel not in timestamps and self.matcher.check_timestamp(ts, timestamps.values()):
+                return True
+        return False
+
+    def _evict(self, ref: int) -> None:
+        group = self._remove(ref)
+        self.stats.evicted_groups += 1
+        for channel, f in group.get_frames().items():
+            if f.is_complete():
+                self.stats.add_orphan(channel)
+
+    def _enforce_limits(self) -> None:
+        if self.max_age_ns is not None:
+            cutoff = bisect.bisect_left(self._refs, self._newest_ts - self.max_age_ns)
+            for ref in self._refs[:cutoff]:
+                self._evict(ref)
+        if self.max_pending_groups is not None:
+            while len(self._refs) > self.max_pending_groups:
+                self._evict(self._refs[0])
+
+    def _place(self, frame: Frame, displaced: List[Frame]) -> Optional[GroupOfFrames]:
+        ts = frame.get_timestamp()
+        channel = self.worker_channels[frame.get_stream_id()]
+
+        matched_ts = self._find_group(ts, channel)
+        if matched_ts == 0:
+            if ts in self._unfinished:
+                # Same reference already taken by a group with this channel filled; drop duplicate
+                self.stats.add_orphan(channel)
+                return None
+            if self._partial_refs and self._is_late(ts, channel):
+                self.stats.add_orphan(channel)
+                return None
+            bisect.insort(self._refs, ts)
+            self._unfinished[ts] = GroupOfFrames.new(ts, self.worker_channels)
+            if self.deadline_ns is not None:
+                self._created.append((self._clock(), ts, self._unfinished[ts]))
+            if self.metrics is not None:
+                self._created_at[ts] = self._clock()
+            matched_ts = ts
+
+        if self.metrics is not None:
+            self.metrics.lateness(channel).record(self._clock() - self._created_at[matched_ts])
+        group = self._unfinished[matched_ts]
+        previous = group.get_frames()[channel]
+        if previous.is_complete():
+            # The worse-fitting frame gets another chance to find a group
+            displaced.append(previous)
+        group.set_frame(channel, frame)
+        if not group.is_complete():
+            return None
+
+        self._record_emitted(matched_ts, group)
+        self._remove(matched_ts)
+        self.stats.emitted_groups += 1
+        latest_ts = group.max_timestamp()
+        # Retain only groups whose max_timestamp >= latest_ts; only refs below latest_ts can fail this
+        stale = [ref for ref in self._refs[:bisect.bisect_left(self._refs, latest_ts)]
+                 if self._unfinished[ref].max_timestamp() < latest_ts]
+        for ref in stale:
+            self._evict(ref)
+        return group
+
+    def push(self, frame: Frame) -> List[GroupOfFrames]:
+        if not frame.is_complete():
+            return []
+        if self.reorder_buffers is None:
+            return self._push_ordered([frame])
+        stream_id = frame.get_stream_id()
+        buf = self.reorder_buffers.get(stream_id)
+        if buf is None:
+            buf = self.reorder_buffers[stream_id] = ReorderBuffer(*self._reorder_options)
+        released = buf.push(frame)
+        expiry = buf.next_expiry()
+        if expiry is not None and (self._next_hold_expiry is None or expiry < self._next_hold_expiry):
+            self._next_hold_expiry = expiry
+        return self._push_ordered(released + self._expired_reorder_frames())
+
+    def _expired_reorder_frames(self) -> List[Frame]:
+        # Frames held too long by the reorder buffers of other (possibly stalled) streams; the
+        # buffers are only visited once the earliest of their deadlines has passed
+        if self._next_hold_expiry is None or self._clock() < self._next_hold_expiry:
+            return []
+        frames = [f for buf in self.reorder_buffers.values() for f in buf.release_expired()]
+        expiries = [e for e in (buf.next_expiry() for buf in self.reorder_buffers.values()) if e is not None]
+        self._next_hold_expiry = min(expiries, default=None)
+        return frames
+
+    def _push_ordered(self, frames: List[Frame]) -> List[GroupOfFrames]:
+        out: List[GroupOfFrames] = []
+        for frame in frames:
+            self._newest_ts = max(self._newest_ts, frame.get_timestamp())
+            pending = [frame]
+            while pending:
+                group = self._place(pending.pop(), pending)
+                if group is not None:
+                    out.append(group)
+        self._enforce_limits()
+        if self.metrics is not None:
+            self.metrics.pending_groups = len(self._refs)
+            self.metrics.max_pending_groups = max(self.metrics.max_pending_groups, len(self._refs))
+        return out + self._expire_groups()
+
+    def flush_reorder_buffers(self) -> List[GroupOfFrames]:
+        # Push everything still held in the reorder buffers (e.g. at end of input)
+        if self.reorder_buffers is None:
+            return []
+        frames = [f for buf in self.reorder_buffers.values() for f in buf.flush()]
+        self._next_hold_expiry = None
+        return self._push_ordered(frames)
+
+    def get_reorder_stats(self) -> Dict[str, ReorderStats]:
+        if self.reorder_buffers is None:
+            return {}
+        return {self.worker_channels[sid]: buf.stats for sid, buf in self.reorder_buffers.items()}
+
+    def flush_expired(self) -> List[GroupOfFrames]:
+        # Emit groups past their deadline and frames held past reorder_max_hold_ms; call
+        # periodically to make progress while no frames arrive
+        frames = self._expired_reorder_frames()
+        if frames:
+            return self._push_ordered(frames)
+        return self._expire_groups()
+
+    def _expire_groups(self) -> List[GroupOfFrames]:
+        if self.deadline_ns is None:
+            return []
+        out: List[GroupOfFrames] = []
+        now = self._clock()
+        while self._created and now - self._created[0][0] >= self.deadline_ns:
+            _, ref, group = self._created.popleft()
+            if self._unfinished.get(ref) is not group:
+                continue  # already completed or evicted
+            self._record_emitted(ref, group)
+            self._remove(ref)
+            self._remember_partial(ref, group)
+            self.stats.emitted_groups += 1
+            self.stats.partial_groups += 1
+            out.append(group)
+        return out
+
+    def process(self, frames: Iterable[Frame]) -> Iterator[GroupOfFrames]:
+        for frame in frames:
+            yield from self.push(frame)
+        yield from self.flush_reorder_buffers()
+
+    def pending(self) -> int:
+        return len(self._refs)
+
+
+def timestamp_grouper(
+    frames: Iterable[Frame],
+    worker_channels: List[str],
+    matcher: Optional[TimestampMatcherType] = None,
+    max_pending_groups: Optional[int] = None,
+    max_age_ms: Optional[int] = None,
+) -> List[GroupOfFrames]:
+    return list(TimestampGrouper(worker_channels, matcher, max_pending_groups, max_age_ms).process(frames))
+
+
+# Vectorised offline grouping of recorded timestamps. Instead of Frame objects this works on one
+# int64 timestamp array per channel and returns, per channel, the indices of the matched frames
+# (all arrays have one entry per complete group, ordered by reference timestamp).
+
+def group_timestamp_arrays(
+    channel_timestamps: List[np.ndarray],
+    matcher: Optional[TimestampMatcherType] = None,
+    reference_channel: int = 0,
+) -> List[np.ndarray]:
+    if matcher is None:
+        matcher = TimestampMatcherType.new_exact()
+    window = matcher.get_window() or matcher.get_nearest()
+    window_ns = 0 if window is None else int(window.max_offset_ms) * 1_000_000
+
+    timestamps = [np.asarray(ts, dtype=np.int64) for ts in channel_timestamps]
+    orders = [np.argsort(ts, kind="stable") for ts in timestamps]
+    sorted_ts = [ts[order] for ts, order in zip(timestamps, orders)]
+    if not sorted_ts or any(len(ts) == 0 for ts in sorted_ts):
+        return [np.empty(0, dtype=np.int64) for _ in timestamps]
+
+    refs = sorted_ts[reference_channel]
+    valid = np.ones(len(refs), dtype=bool)
+    matched: List[np.ndarray] = []
+    for channel, ts in enumerate(sorted_ts):
+        if channel == reference_channel:
+            matched.append(np.arange(len(refs), dtype=np.int64))
+            continue
+        # Nearest neighbour of every reference via searchsorted on the sorted channel
+        right = np.clip(np.searchsorted(ts, refs, side="left"), 0, len(ts) - 1)
+        left = np.clip(right - 1, 0, len(ts) - 1)
+        pick_left = np.abs(ts[left] - refs) < np.abs(ts[right] - refs)
+        idx = np.where(pick_left, left, right)
+        dist = np.abs(ts[idx] - refs)
+        ok = dist <= window_ns
+        # A frame may only join one group: keep the closest reference among duplicates
+        order = np.lexsort((dist, idx))
+        _, first = np.unique(idx[order], return_index=True)
+        keep = np.zeros(len(refs), dtype=bool)
+        keep[order[first]] = True
+        valid &= ok & keep
+        matched.append(idx)
+
+    # Window semantics: all members pairwise within the window, i.e. max - min <= window
+    if window_ns > 0 and len(sorted_ts) > 2:
+        member_ts = np.stack([ts[idx] for ts, idx in zip(sorted_ts, matched)])
+        valid &= (member_ts.max(axis=0) - member_ts.min(axis=0)) <= window_ns
+
+    return [order[idx[valid]] for order, idx in zip(orders, matched)]
@@ -1,6 +1,7 @@
 from __future__ import annotations
-from dataclasses import dataclass
-from typing import List, Tuple, Dict, Optional, Union
+from dataclasses import FrozenInstanceError, dataclass, fields
+from functools import lru_cache
+from typing import Any, Iterable, List, Tuple, Dict, Optional, Union
 from numpy import uint8, uint32, uint64
 
 from . import model
@@ -27,6 +28,9 @@ __all__ = [
     "GeometryContentConfig",
     "TransformContentConfig",
     "SemanticType",
+    "InternedSemanticType",
+    "parse_semantic_type",
+    "register_semantic_types",
     "BaseIdentifierStorageType",
     "IdentifierStorageType",
     "ScalarType",
@@ -40,7 +44,9 @@ __all__ = [
 
 # python
 
-
+# Plain int copies of the masks used when parsing identifiers
+_BASE_TYPE_MASK = int(constants.BASE_TYPE_MASK)
+_SEMANTIC_TYPE_MASK = int(constants.SEMANTIC_TYPE_MASK)
 
 
 def combine_flags(flags: List[uint64]) -> uint64:
@@ -65,7 +71,7 @@ ContentTypeConfigStorage = Union[
 
 
 def get_content_type(value: uint64) -> Optional[ContentTypes]:
-    ct_u8 = uint8((uint64(value) & uint64(constants.CONTENT_TYPE_MASK)) >> uint8(constants.CONTENT_TYPE_OFFSET))
+    ct_u8 = (int(value) >> constants.CONTENT_TYPE_OFFSET) & 0xFF
     return ContentTypes.from_u8(ct_u8) or ContentTypes.None_
 
 def set_content_type(content_type: ContentTypes) -> uint64:
@@ -96,7 +102,7 @@ def _content_storage_to_type(cfg: ContentTypeConfigStorage) -> ContentTypes:
 
 
 def _content_from_type_and_id(ct: ContentTypes, semantic_bits: uint64) -> ContentTypeConfigStorage:
-    masked = uint64(semantic_bits) & uint64(constants.SEMANTIC_TYPE_MASK)
+    masked = int(semantic_bits) & _SEMANTIC_TYPE_MASK
     if ct == ContentTypes.Generic:
         return GenericContentConfig.from_u64(masked)
     if ct == ContentTypes.Image:
@@ -117,10 +123,11 @@ class BaseType:
 
     @staticmethod
     def from_identifier(value: BaseIdentifierStorageType) -> "BaseType":
-        st = uint64(uint64(value) & uint64(constants.SCALAR_TYPE_MASK)) >> uint8(constants.SCALAR_TYPE_OFFSET)
-        cat = uint64(uint64(value) & uint64(constants.CARDINALITY_TYPE_MASK)) >> uint8(constants.CARDINALITY_TYPE_OFFSET)
-        ct = uint64(uint64(value) & uint64(constants.CONTAINER_TYPE_MASK)) >> uint8(constants.CONTAINER_TYPE_OFFSET)
-        mrt = uint64(uint64(value) & uint64(constants.MEMORY_REPRESENTATION_TYPE_MASK)) >> uint8(constants.MEMORY_REPRESENTATION_TYPE_OFFSET)
+        value = int(value)
+        st = (value >> constants.SCALAR_TYPE_OFFSET) & 0x3F
+        cat = (value >> constants.CARDINALITY_TYPE_OFFSET) & 0x03
+        ct = (value >> constants.CONTAINER_TYPE_OFFSET) & 0x3F
+        mrt = (value >> constants.MEMORY_REPRESENTATION_TYPE_OFFSET) & 0x03
         return BaseType(
             scalar_type=ScalarType.from_u8(st) or ScalarType.None_,
             cardinality_type=CardinalityType.from_u8(cat) or CardinalityType.None_,
@@ -177,10 +184,10 @@ class SemanticType:
             self.base_type = BaseType()
             self.content_type: ContentTypeConfigStorage = InvalidContentConfig()
         else:
-            base_bits = uint64(semantic_type_id) & uint64(constants.BASE_TYPE_MASK)
-            self.base_type = BaseType.from_identifier(base_bits)
-            ct = get_content_type(semantic_type_id)
-            self.content_type = _content_from_type_and_id(ct, uint64(semantic_type_id))
+            value = int(semantic_type_id)
+            self.base_type = BaseType.from_identifier(value & _BASE_TYPE_MASK)
+            ct = get_content_type(value)
+            self.content_type = _content_from_type_and_id(ct, value)
 
     @staticmethod
     def new(semantic_type_id: IdentifierStorageType) -> "SemanticType":
@@ -286,4 +293,97 @@ class SemanticType:
             f"custom2='{custom2}', "
             f"custom_mask='{mask}'"
             ")"
-        )
\ No newline at end of file
+        )
+
+
+class _ReadOnly:
+    # Mixin for the parts of an interned SemanticType: one instance is shared by every caller, so
+    # assignment raises. Compares equal to, and pickles as, the plain (mutable) type.
+    __slots__ = ()
+    _thawed_type: type = object
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise FrozenInstanceError(f"cannot assign to {name!r} of an interned semantic type")
+
+    def __delattr__(self, name: str) -> None:
+        raise FrozenInstanceError(f"cannot delete {name!r} of an interned semantic type")
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, self._thawed_type):
+            return NotImplemented
+        return all(getattr(self, f.name) == getattr(other, f.name) for f in fields(self))
+
+    __hash__ = None
+
+    def __reduce__(self):
+        return self._thawed_type, tuple(getattr(self, f.name) for f in fields(self))
+
+
+_READ_ONLY_TYPES: Dict[type, type] = {}
+
+
+def _read_only(value: Any) -> Any:
+    cls = type(value)
+    if cls.__dataclass_params__.frozen:
+        return value
+    read_only = _READ_ONLY_TYPES.get(cls)
+    if read_only is None:
+        # Same qualname so the dataclass repr is unchanged
+        read_only = _READ_ONLY_TYPES[cls] = type(cls.__name__, (_ReadOnly, cls), {"_thawed_type": cls, "__qualname__": cls.__qualname__})
+    result = object.__new__(read_only)
+    for f in fields(value):
+        object.__setattr__(result, f.name, getattr(value, f.name))
+    return result
+
+
+class InternedSemanticType(SemanticType):
+    # Read-only SemanticType handed out by parse_semantic_type(), with the identifier and repr
+    # computed once. The setters raise FrozenInstanceError; use SemanticType(identifier) for a
+    # copy that can be modified.
+    def __init__(self, semantic_type_id: IdentifierStorageType):
+        parsed = SemanticType(semantic_type_id)
+        object.__setattr__(self, "_semantic_type_id", int(semantic_type_id))
+        object.__setattr__(self, "base_type", _read_only(parsed.base_type))
+        object.__setattr__(self, "content_type", _read_only(parsed.content_type))
+        object.__setattr__(self, "_identifier", parsed.to_identifier())
+        object.__setattr__(self, "_repr", SemanticType.__repr__(self))
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise FrozenInstanceError(f"cannot assign to {name!r} of an interned semantic type")
+
+    def __delattr__(self, name: str) -> None:
+        raise FrozenInstanceError(f"cannot delete {name!r} of an interned semantic type")
+
+    def __reduce__(self):
+        return parse_semantic_type, (self._semantic_type_id,)
+
+    def to_identifier(self) -> IdentifierStorageType:
+        return self._identifier
+
+    def __repr__(self) -> str:
+        return self._repr
+
+
+# Predefined identifiers (datamodel constants) stay parsed for the lifetime of the process;
+# anything else seen on the wire goes through a bounded LRU.
+_PREDEFINED: Dict[int, InternedSemanticType] = {}
+
+
+@lru_cache(maxsize=1024)
+def _intern(semantic_type_id: int) -> InternedSemanticType:
+    return InternedSemanticType(semantic_type_id)
+
+
+def parse_semantic_type(semantic_type_id: IdentifierStorageType) -> InternedSemanticType:
+    # Shared parse for per-frame inspection: a dict lookup for predefined identifiers
+    st = _PREDEFINED.get(semantic_type_id)
+    if st is None:
+        st = _intern(int(semantic_type_id))
+    return st
+
+
+def register_semantic_types(semantic_type_ids: Iterable[IdentifierStorageType]) -> None:
+    for semantic_type_id in semantic_type_ids:
+        value = int(semantic_type_id)
+        if value not in _PREDEFINED:
+            _PREDEFINED[value] = InternedSemanticType(value)
@@ -21,20 +21,21 @@ class GeometryContentConfig:
     @classmethod
     def new(cls, value: uint64) -> "GeometryContentConfig":
         cfg = cls()
+        value = int(value)
         cfg.compression_type = GeometryCompressionTypes.from_u8(
-            ((uint64(value) & uint64(constants.COMPRESSION_TYPE_MASK)) >> uint8(constants.COMPRESSION_TYPE_OFFSET))
+            (value >> constants.COMPRESSION_TYPE_OFFSET) & 0xFF
         )
         cfg.format_type = GeometryFormatTypes.from_u8(
-            ((uint64(value) & uint64(constants.FORMAT_TYPE_MASK)) >> uint8(constants.FORMAT_TYPE_OFFSET))
+            (value >> constants.FORMAT_TYPE_OFFSET) & 0xFF
         )
         cfg.custom1_type = EmptyCustomType.from_u8(
-            ((uint64(value) & uint64(constants.CUSTOM1_TYPE_MASK)) >> uint8(constants.CUSTOM1_TYPE_OFFSET))
+            (value >> constants.CUSTOM1_TYPE_OFFSET) & 0xFF
         )
         cfg.custom2_type = EmptyCustomType.from_u8(
-            ((uint64(value) & uint64(constants.CUSTOM2_TYPE_MASK)) >> uint8(constants.CUSTOM2_TYPE_OFFSET))
+            (value >> constants.CUSTOM2_TYPE_OFFSET) & 0xFF
         )
         cfg.custom_mask_type = uint64(
-            ((uint64(value) & uint64(constants.CUSTOM_MASK_TYPE_MASK)) >> uint8(constants.CUSTOM_MASK_TYPE_OFFSET))
+            (value >> constants.CUSTOM_MASK_TYPE_OFFSET) & 0xFF
         )
         return cfg
 
@@ -22,20 +22,21 @@ class ImageContentConfig:
     @classmethod
     def new(cls, value: uint64) -> "ImageContentConfig":
         cfg = cls()
+        value = int(value)  # plain int bit arithmetic, numpy scalars are much slower
         cfg.compression_type = ImageCompressionTypes.from_u8(
-            ((uint64(value) & uint64(constants.COMPRESSION_TYPE_MASK)) >> uint8(constants.COMPRESSION_TYPE_OFFSET))
+            (value >> constants.COMPRESSION_TYPE_OFFSET) & 0xFF
         )
         cfg.format_type = ImageFormatTypes.from_u8(
-            ((uint64(value) & uint64(constants.FORMAT_TYPE_MASK)) >> uint8(constants.FORMAT_TYPE_OFFSET))
+            (value >> constants.FORMAT_TYPE_OFFSET) & 0xFF
         )
         cfg.custom1_type = EmptyCustomType.from_u8(
-            ((uint64(value) & uint64(constants.CUSTOM1_TYPE_MASK)) >> uint8(constants.CUSTOM1_TYPE_OFFSET))
+            (value >> constants.CUSTOM1_TYPE_OFFSET) & 0xFF
         )
         cfg.custom2_type = EmptyCustomType.from_u8(
-            ((uint64(value) & uint64(constants.CUSTOM2_TYPE_MASK)) >> uint8(constants.CUSTOM2_TYPE_OFFSET))
+            (value >> constants.CUSTOM2_TYPE_OFFSET) & 0xFF
         )
         cfg.custom_mask_type = EmptyMaskType.from_u8(
-            ((uint64(value) & uint64(constants.CUSTOM_MASK_TYPE_MASK)) >> uint8(constants.CUSTOM_MASK_TYPE_OFFSET))
+            (value >> constants.CUSTOM_MASK_TYPE_OFFSET) & 0xFF
         )
         return cfg
 
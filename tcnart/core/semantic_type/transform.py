@@ -1,6 +1,6 @@
 from __future__ import annotations
 from dataclasses import dataclass
-from numpy import uint8, uint64
+from numpy import uint8
 
 from .model import (
     constants,
@@ -23,20 +23,21 @@ class TransformContentConfig:
     @classmethod
     def new(cls, value: int) -> "TransformContentConfig":
         cfg = cls()
+        value = int(value)
         cfg.compression_type = TransformCompressionTypes.from_u8(
-            ((uint64(value) & uint64(constants.COMPRESSION_TYPE_MASK)) >> uint8(constants.COMPRESSION_TYPE_OFFSET))
+            (value >> constants.COMPRESSION_TYPE_OFFSET) & 0xFF
         )
         cfg.format_type = TransformFormatTypes.from_u8(
-            ((uint64(value) & uint64(constants.FORMAT_TYPE_MASK)) >> uint8(constants.FORMAT_TYPE_OFFSET))
+            (value >> constants.FORMAT_TYPE_OFFSET) & 0xFF
         )
         cfg.custom1_type = TransformDetailTypes.from_u8(
-            ((uint64(value) & uint64(constants.CUSTOM1_TYPE_MASK)) >> uint8(constants.CUSTOM1_TYPE_OFFSET))
+            (value >> constants.CUSTOM1_TYPE_OFFSET) & 0xFF
         )
         cfg.custom2_type = EmptyCustomType.from_u8(
-            ((uint64(value) & uint64(constants.CUSTOM2_TYPE_MASK)) >> uint8(constants.CUSTOM2_TYPE_OFFSET))
+            (value >> constants.CUSTOM2_TYPE_OFFSET) & 0xFF
         )
         cfg.custom_mask_type = EmptyMaskType.from_u8(
-            ((uint64(value) & uint64(constants.CUSTOM_MASK_TYPE_MASK)) >> uint8(constants.CUSTOM_MASK_TYPE_OFFSET))
+            (value >> constants.CUSTOM_MASK_TYPE_OFFSET) & 0xFF
         )
         return cfg
 
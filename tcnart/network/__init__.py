@@ -1,15 +1,26 @@
-from .discovery import get_or_waitfor_descriptor, find_camera_sensors, build_channel_configs
+from .discovery import get_or_waitfor_descriptor, find_camera_sensors, build_channel_configs, build_channel_offsets
+from .common import create_shm_provider
+from .publisher import publish_message
 from .receiver import (
     receive_zenoh_messages,
     resolve_stream_descriptors,
     start_all_receivers,
+    open_session_pool,
+    assign_stream_sessions,
+    stream_bandwidth,
 )
 
 __all__ = [
     "get_or_waitfor_descriptor",
     "find_camera_sensors",
     "build_channel_configs",
+    "build_channel_offsets",
     "receive_zenoh_messages",
     "resolve_stream_descriptors",
     "start_all_receivers",
+    "open_session_pool",
+    "assign_stream_sessions",
+    "stream_bandwidth",
+    "create_shm_provider",
+    "publish_message",
 ]
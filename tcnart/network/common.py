@@ -4,6 +4,15 @@ import zenoh
 import logging
 from typing import Optional
 
+from ..serialization.error import MessageError
+
+try:
+    from zenoh import shm as zenoh_shm  # requires a zenoh build with shared-memory support
+except ImportError:
+    zenoh_shm = None
+
+log = logging.getLogger(__name__)
+
 
 def _get_topic(sample: Any) -> str:
     return str(getattr(sample, "key_expr", ""))
@@ -27,6 +36,7 @@ def _extract_payload(sample: Any) -> bytes:
         if isinstance(pay, (bytes, bytearray)):
             return bytes(pay)
         elif isinstance(pay, zenoh.ZBytes):
+            # Shared-memory payloads expose no buffer protocol either, so this is one copy in all cases
             return pay.to_bytes()
     except Exception as e:
         log.exception(e)
@@ -34,6 +44,40 @@ def _extract_payload(sample: Any) -> bytes:
     return b""
 
 
+def create_shm_provider(config: Any, size: int) -> Optional[Any]:
+    # Provider for publish_message on a session opened with config (a zenoh.Config). Returns None
+    # (plain payloads) when zenoh lacks shared-memory support; raises when the config disables it,
+    # since such a session sends shared-memory buffers as regular payloads, at the cost of a copy.
+    if zenoh_shm is None:
+        return None
+    try:
+        enabled = config.get_json("transport/shared_memory/enabled") == "true"
+    except Exception as e:
+        raise MessageError(MessageError.NETWORK_ERROR, f"Cannot read transport/shared_memory/enabled: {e}")
+    if not enabled:
+        raise MessageError(
+            MessageError.NETWORK_ERROR,
+            "Shared memory is disabled in the zenoh config; set transport/shared_memory/enabled to true",
+        )
+    try:
+        return zenoh_shm.ShmProvider.default_backend(int(size))
+    except Exception as e:
+        log.warning(f"Shared memory unavailable, using regular payloads: {e}")
+        return None
+
+
+def _make_payload(data: bytes, shm_provider: Optional[Any] = None) -> Any:
+    if shm_provider is not None and len(data) > 0:
+        try:
+            buf = shm_provider.alloc(len(data), zenoh_shm.GarbageCollect())
+            buf[:] = data
+            return buf
+        except Exception as e:
+            # Segment exhausted or SHM disabled on this session
+            log.debug(f"Falling back to regular payload: {e}")
+    return data
+
+
 def _declare_subscriber(session: Any, key_expr: str, queue: List[Any]) -> Any:
     def _cb(sample: Any) -> None:
         queue.append(sample)
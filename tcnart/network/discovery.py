@@ -163,4 +163,24 @@ def build_channel_configs(
 
         # TODO: IR stream handling if needed
 
-    return channels_config, channel_calibrations, channel_poses
\ No newline at end of file
+    return channels_config, channel_calibrations, channel_poses
+
+
+def _signed_offset(value: int) -> int:
+    # Offsets travel as uint64; values at or above 2**63 are negative offsets in two's complement
+    value = int(value)
+    return value - (1 << 64) if value >= 1 << 63 else value
+
+
+def build_channel_offsets(sensors: List[DeviceContextReply], offset_unit_ns: int = 1) -> Dict[str, int]:
+    # Per-sensor clock offset in ns, such that host time = device time + offset. The RPC reply value
+    # (DeviceContextReply.timestamp_offset, in units of offset_unit_ns) takes precedence over the
+    # sensor message (CameraSensorMessage.timestamp_offset_ns). Receivers check the sign against
+    # the host clock on the first frame (see offset_sign_plausible).
+    channel_offsets: Dict[str, int] = {}
+    for sensor in list(sensors):
+        offset = _signed_offset(sensor.timestamp_offset) * int(offset_unit_ns)
+        if offset == 0:
+            offset = _signed_offset(sensor.value.timestamp_offset_ns)
+        channel_offsets[sensor.name] = offset
+    return channel_offsets
@@ -0,0 +1,50 @@
+from __future__ import annotations
+from typing import Any, Optional
+import logging
+
+import zenoh  # type: ignore
+
+from .common import _make_payload
+from ..serialization.cdr_serialization import encode_into, encode_raw_message, encoded_size, get_message_schema_name
+from ..serialization.compression import MIN_COMPRESSED_SIZE, compress_payload, join_attachment
+from ..serialization.error import MessageError
+from ..schema.model import MessageSchema
+
+log = logging.getLogger(__name__)
+
+
+def publish_message(
+    target: Any,  # zenoh Session (with key_expr) or declared Publisher
+    message: Any,
+    key_expr: Optional[str] = None,
+    type_name: Optional[str] = None,
+    shm_provider: Optional[Any] = None,
+    scratch: Optional[bytearray] = None,
+    compression: Optional[str] = None,  # payload codec name, e.g. "zlib" for raw image streams
+) -> None:
+    # The schema name travels in the attachment, which is what the receivers use to pick a decoder.
+    # A scratch bytearray kept by the caller is resized and serialized into in place, so repeated
+    # publishing of large frames does not allocate a new payload each time.
+    if type_name is None:
+        type_name = get_message_schema_name(MessageSchema(message))
+    if scratch is not None:
+        size = encoded_size(message)
+        if len(scratch) != size:
+            scratch[size:] = b""
+            scratch.extend(bytes(size - len(scratch)))
+        encode_into(message, scratch)
+        data: Any = scratch
+    else:
+        data = encode_raw_message(message, type_name)
+    attachment = type_name
+    if compression is not None and len(data) >= MIN_COMPRESSED_SIZE:
+        data = compress_payload(compression, data)
+        attachment = join_attachment(type_name, compression)
+    payload = _make_payload(data, shm_provider)
+    try:
+        if key_expr is not None:
+            target.put(key_expr, payload, encoding=zenoh.Encoding.APPLICATION_CDR, attachment=attachment)
+        else:
+            target.put(payload, encoding=zenoh.Encoding.APPLICATION_CDR, attachment=attachment)
+    except Exception as e:
+        raise MessageError(MessageError.NETWORK_ERROR, str(e))
@@ -7,11 +7,14 @@ import logging
 import zenoh  # type: ignore
 
 from .common import _get_attachment, _extract_payload, _declare_subscriber
-from ..serialization.cdr_serialization import decode_raw_message
+from ..serialization.compression import split_attachment
+from ..serialization.validation import RejectLog, decode_checked
 from ..serialization.error import MessageError
 from ..schema.messages.common import InvalidMessage
-from ..core.frames import Frame, FrameAnnotation
+from ..core.frames import Frame, FrameAnnotation, SharedAnnotations
 from ..core.dataflow import StreamConfig
+from ..core.clock import ClockOffsetEstimator, offset_sign_plausible
+from ..core.buffer_pool import BufferPool
 
 log = logging.getLogger(__name__)
 
@@ -29,13 +32,22 @@ def receive_zenoh_messages(
     annotations: Dict[str, FrameAnnotation],
     shutdown_event: Optional[Any] = None,
     wait_poll_ms: int = 100,
+    timestamp_offset_ns: int = 0,
+    clock_estimator: Optional[ClockOffsetEstimator] = None,
+    buffer_pool: Optional[BufferPool] = None,
 ) -> None:
     if zenoh is None:
         raise MessageError(MessageError.NETWORK_ERROR, "zenoh is not available")
 
     rx: List[Any] = []
+    rejects = RejectLog(log)  # malformed payloads are counted, not logged one by one
+    # Image bytes are decoded straight into pooled buffers; consumers return them with buffer_pool.release()
+    blob = buffer_pool.fill if buffer_pool is not None else None
     sub = _declare_subscriber(session, topic, rx)
     default_type = "tcnart_msgs::msg::VideoStreamMessage"  # best-effort default
+    # One read-only annotation map per stream, referenced by every frame
+    shared_annotations = SharedAnnotations(annotations)
+    offset_checked = timestamp_offset_ns == 0
 
     log.info(f"Starting receiver for {source} @ {topic}")
     try:
@@ -44,12 +56,11 @@ def receive_zenoh_messages(
                 break
             if rx:
                 sample = rx.pop(0)
-                type_name = _get_attachment(sample, default_type)
+                type_name, codec = split_attachment(_get_attachment(sample, default_type))
                 payload = _extract_payload(sample)
-                try:
-                    msg = decode_raw_message(type_name, payload)
-                except MessageError as e:
-                    log.exception(e)
+                msg, check = decode_checked(type_name, payload, codec, blob)
+                if not check:
+                    rejects.report(source, check)
                     msg = InvalidMessage()
 
                 if hasattr(msg, "get_timestamp"):
@@ -59,9 +70,17 @@ def receive_zenoh_messages(
                     ts = 0
 
                 if ts != 0:
-                    frame = Frame.create(ts, int(semantic_type), int(stream_index), msg)
-                    for k, v in annotations.items():
-                        frame.add_annotation(k, v)
+                    # Normalise to the common clock: static sensor offset (host = device + offset),
+                    # then learned residual skew
+                    if not offset_checked:
+                        offset_checked = True
+                        if not offset_sign_plausible(ts, timestamp_offset_ns, time.time_ns()):
+                            log.warning(f"{source}: timestamps minus the {timestamp_offset_ns} ns clock offset are closer "
+                                        f"to host time than plus it; check the sensor's offset convention")
+                    ts += timestamp_offset_ns
+                    if clock_estimator is not None:
+                        ts = clock_estimator.correct(int(stream_index), ts)
+                    frame = Frame.create(ts, int(semantic_type), int(stream_index), msg, shared_annotations)
 
                     # Dispatch to sender
                     if hasattr(sender, "put") and callable(getattr(sender, "put")):
@@ -102,6 +121,7 @@ def resolve_stream_descriptors(
     channel_poses: Dict[str, Any],
     channels_config: List[tuple[str, str, str]],
     session: Any,
+    channel_offsets: Optional[Dict[str, int]] = None,
 ) -> Dict[str, StreamConfig]:
     from .discovery import get_or_waitfor_descriptor
 
@@ -120,19 +140,71 @@ def resolve_stream_descriptors(
             pose=pose,
             shutdown_event=shutdown_event,
         )
+        if channel_offsets is not None:
+            cfg.timestamp_offset_ns = int(channel_offsets.get(sensor, 0))
         channels[cfg.stream_name] = cfg
     return channels
 
 
+def stream_bandwidth(config: StreamConfig) -> int:
+    # Expected bytes/s of a stream from its descriptor (BufferInfo.frame_size x frame_rate)
+    descriptor = getattr(config, "descriptor", None)
+    if descriptor is None:
+        return 0
+    try:
+        return int(descriptor.buffer_info.frame_size) * int(descriptor.frame_rate)
+    except Exception as e:
+        log.exception(e)
+        return 0
+
+
+def assign_stream_sessions(channels: Dict[str, StreamConfig], num_sessions: int) -> Dict[str, int]:
+    # Greedy load balancing: heaviest stream first onto the least loaded session
+    num_sessions = max(1, num_sessions)
+    load = [0] * num_sessions
+    assignment: Dict[str, int] = {}
+    for key, config in sorted(channels.items(), key=lambda kv: stream_bandwidth(kv[1]), reverse=True):
+        index = min(range(num_sessions), key=lambda i: load[i])
+        assignment[key] = index
+        load[index] += stream_bandwidth(config)
+    return assignment
+
+
+def open_session_pool(zenoh_config: Any, num_sessions: int) -> List[Any]:
+    # Each zenoh session has its own callback thread; open several to spread receive load over cores
+    sessions: List[Any] = []
+    try:
+        for _ in range(max(1, num_sessions)):
+            sessions.append(zenoh.open(zenoh_config))
+    except Exception as e:
+        for s in sessions:
+            try:
+                s.close()
+            except Exception as e2:
+                log.exception(e2)
+        raise MessageError(MessageError.NETWORK_ERROR, str(e))
+    return sessions
+
+
 def start_all_receivers(
     num_workers: int,
     shutdown_event: Optional[Any],
     worker_senders: List[Any],
     session: Any,
     channels: Dict[str, StreamConfig],
+    session_pool: Optional[List[Any]] = None,
+    clock_estimator: Optional[ClockOffsetEstimator] = None,  # also pass it to the grouper, which trains it
+    buffer_pool_size: int = 0,
 ) -> List[threading.Thread]:
     threads: List[threading.Thread] = []
 
+    # Shard streams over a pool of sessions by expected bandwidth; default is the single shared session
+    session_assignment: Dict[str, int] = {}
+    if session_pool:
+        session_assignment = assign_stream_sessions(channels, len(session_pool))
+        for key, index in session_assignment.items():
+            log.info(f"Assigning {key} ({stream_bandwidth(channels[key])} B/s) to session {index}")
+
     for key, config in channels.items():
         descriptor = getattr(config, "descriptor", None)
         if descriptor is None:
@@ -160,11 +232,19 @@ def start_all_receivers(
         worker_id = stream_id % max(1, num_workers)
         sender = worker_senders[worker_id]
         annotations = dict(config.annotations)
+        stream_session = session_pool[session_assignment[key]] if session_pool else session
+
+        # Preallocated image buffers for fixed-size streams, exposed to consumers via config.buffer_pool
+        if buffer_pool_size > 0 and config.buffer_pool is None:
+            try:
+                config.buffer_pool = BufferPool.from_buffer_info(descriptor.buffer_info, buffer_pool_size)
+            except Exception as e:
+                log.exception(e)
 
         t = threading.Thread(
             target=receive_zenoh_messages,
             kwargs=dict(
-                session=session,
+                session=stream_session,
                 topic=topic,
                 source=key,
                 stream_index=stream_id,
@@ -173,6 +253,9 @@ def start_all_receivers(
                 sender=sender,
                 annotations=annotations,
                 shutdown_event=shutdown_event,
+                timestamp_offset_ns=int(config.timestamp_offset_ns),
+                clock_estimator=clock_estimator,
+                buffer_pool=config.buffer_pool,
             ),
             daemon=True,
         )
@@ -1,22 +1,140 @@
 from __future__ import annotations
+import hashlib
 import threading
 import time
-from typing import Any, Dict, List, Optional
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
 import logging
 
 import zenoh  # type: ignore
 
 from .common import _get_attachment, _extract_payload, _declare_subscriber, _get_topic
-from ..serialization.cdr_serialization import decode_raw_message
-from ..serialization.error import MessageError
-from ..schema.messages.srg_engine import SISJoinMessage
+from ..serialization.compression import split_attachment
+from ..serialization.validation import RejectLog, decode_checked
+from ..schema.messages.srg_engine import (
+    SISJoinMessage,
+    SISComponentMessage,
+    SISComponentRef,
+    SISRelationMessage,
+)
 from ..schema.messages.common import InvalidMessage
 from ..core.frames import Frame, FrameAnnotation
-from ..core.dataflow import StreamConfig
+from ..core.dataflow import StreamConfig, _dispatch
 
 log = logging.getLogger(__name__)
 
 
+RelationKey = Tuple[str, str]
+
+
+def _component_key(component: SISComponentMessage) -> str:
+    return component.node.name
+
+
+def _relation_key(relation: SISRelationMessage) -> RelationKey:
+    return (relation.edge.from_.name, relation.edge.to.name)
+
+
+@dataclass
+class SISJoinDiff:
+    # Structured change set between two consecutive SISJoinMessages of one publisher
+    origin: SISComponentRef = field(default_factory=SISComponentRef)
+    added_components: List[SISComponentMessage] = field(default_factory=list)
+    removed_components: List[SISComponentMessage] = field(default_factory=list)
+    changed_components: List[SISComponentMessage] = field(default_factory=list)
+    added_relations: List[SISRelationMessage] = field(default_factory=list)
+    removed_relations: List[SISRelationMessage] = field(default_factory=list)
+    changed_relations: List[SISRelationMessage] = field(default_factory=list)
+
+    @staticmethod
+    def between(previous: Optional[SISJoinMessage], current: SISJoinMessage) -> "SISJoinDiff":
+        diff = SISJoinDiff(origin=current.origin)
+        prev_components = {} if previous is None else {_component_key(c): c for c in previous.components}
+        prev_relations = {} if previous is None else {_relation_key(r): r for r in previous.relations}
+        cur_components = {_component_key(c): c for c in current.components}
+        cur_relations = {_relation_key(r): r for r in current.relations}
+
+        for key, component in cur_components.items():
+            old = prev_components.get(key)
+            if old is None:
+                diff.added_components.append(component)
+            elif old != component:
+                diff.changed_components.append(component)
+        diff.removed_components = [c for key, c in prev_components.items() if key not in cur_components]
+
+        for key, relation in cur_relations.items():
+            old = prev_relations.get(key)
+            if old is None:
+                diff.added_relations.append(relation)
+            elif old != relation:
+                diff.changed_relations.append(relation)
+        diff.removed_relations = [r for key, r in prev_relations.items() if key not in cur_relations]
+        return diff
+
+    def is_empty(self) -> bool:
+        return not (
+            self.added_components or self.removed_components or self.changed_components
+            or self.added_relations or self.removed_relations or self.changed_relations
+        )
+
+
+DEFAULT_MAX_IDLE_S = 60.0
+
+
+class SISJoinCoalescer:
+    # Drops exact re-announcements per publisher topic and turns real updates into SISJoinDiffs.
+    # A topic deleted or silent for max_idle_s (publishers re-announce periodically) is forgotten,
+    # with a diff removing everything it had announced.
+    def __init__(self, max_idle_s: float = DEFAULT_MAX_IDLE_S, clock: Callable[[], float] = time.monotonic) -> None:
+        self.max_idle_s = max_idle_s
+        self._clock = clock
+        self._digests: Dict[str, bytes] = {}
+        self._messages: Dict[str, SISJoinMessage] = {}
+        self._last_seen: Dict[str, float] = {}
+        self._next_prune = float("inf")  # no topic can be idle for max_idle_s before this
+
+    @staticmethod
+    def digest(payload: bytes) -> bytes:
+        return hashlib.blake2b(payload, digest_size=16).digest()
+
+    def is_repeat(self, topic: str, digest: bytes) -> bool:
+        if self._digests.get(topic) != digest:
+            return False
+        self._last_seen[topic] = self._clock()
+        return True
+
+    def update(self, topic: str, digest: bytes, msg: SISJoinMessage) -> Optional[SISJoinDiff]:
+        self._digests[topic] = digest
+        self._last_seen[topic] = now = self._clock()
+        self._next_prune = min(self._next_prune, now + self.max_idle_s)
+        diff = SISJoinDiff.between(self._messages.get(topic), msg)
+        self._messages[topic] = msg
+        if diff.is_empty():
+            return None
+        return diff
+
+    def forget(self, topic: str) -> Optional[SISJoinDiff]:
+        self._digests.pop(topic, None)
+        self._last_seen.pop(topic, None)
+        previous = self._messages.pop(topic, None)
+        if previous is None:
+            return None
+        diff = SISJoinDiff.between(previous, SISJoinMessage(origin=previous.origin))
+        return None if diff.is_empty() else diff
+
+    def prune(self) -> List[Tuple[str, SISJoinDiff]]:
+        now = self._clock()
+        if now < self._next_prune:
+            return []
+        cutoff = now - self.max_idle_s
+        out = []
+        for topic in [t for t, seen in self._last_seen.items() if seen <= cutoff]:
+            diff = self.forget(topic)
+            if diff is not None:
+                out.append((topic, diff))
+        self._next_prune = min(self._last_seen.values(), default=float("inf")) + self.max_idle_s
+        return out
+
 
 def sis_join_subscriber(
     session: Any,
@@ -24,9 +142,13 @@ def sis_join_subscriber(
     sender: Any,  # queue-like with put(), callable, or list
     shutdown_event: Optional[Any] = None,
     wait_poll_ms: int = 100,
+    coalesce: bool = False,
 ) -> None:
+    # With coalesce=True, exact repeats are dropped and (topic, SISJoinDiff) is sent instead of (topic, msg)
+    coalescer = SISJoinCoalescer() if coalesce else None
 
     rx: List[Any] = []
+    rejects = RejectLog(log)  # malformed payloads are counted, not logged one by one
     sub = _declare_subscriber(session, topic, rx)
     default_type = "tcnart_msgs::msg::SISJoinMessage"  # best-effort default
 
@@ -35,24 +157,42 @@ def sis_join_subscriber(
         while True:
             if shutdown_event is not None and getattr(shutdown_event, "is_set", lambda: False)():
                 break
+            if coalescer is not None:
+                for pruned in coalescer.prune():
+                    _dispatch(sender, pruned)
             if rx:
                 sample = rx.pop(0)
                 rcv_topic = _get_topic(sample)
-                type_name = _get_attachment(sample, default_type)
+                type_name, codec = split_attachment(_get_attachment(sample, default_type))
+                if coalescer is not None and getattr(sample, "kind", None) == zenoh.SampleKind.DELETE:
+                    diff = coalescer.forget(rcv_topic)
+                    if diff is not None:
+                        _dispatch(sender, (rcv_topic, diff))
+                    continue
                 payload = _extract_payload(sample)
-                try:
-                    msg = decode_raw_message(type_name, payload)
-                except MessageError as e:
-                    log.exception(e)
+                digest = b""
+                if coalescer is not None:
+                    digest = coalescer.digest(payload)
+                    if coalescer.is_repeat(rcv_topic, digest):
+                        continue
+                msg, check = decode_checked(type_name, payload, codec)
+                if not check:
+                    rejects.report(rcv_topic, check)
                     msg = InvalidMessage()
 
+                item: Any = msg
+                if coalescer is not None and isinstance(msg, SISJoinMessage):
+                    item = coalescer.update(rcv_topic, digest, msg)
+                    if item is None:
+                        continue
+
                 # Dispatch to sender
                 if hasattr(sender, "put") and callable(getattr(sender, "put")):
-                    sender.put((rcv_topic, msg))
+                    sender.put((rcv_topic, item))
                 elif callable(sender):
-                    sender((rcv_topic, msg))
+                    sender((rcv_topic, item))
                 elif isinstance(sender, list):
-                    sender.append((rcv_topic, msg))
+                    sender.append((rcv_topic, item))
                 else:
                     # No valid sink; drop
                     log.warning(f"No valid sink for {topic}")
@@ -79,6 +219,7 @@ def start_sis_join_subscriber(
     sender: Any,
     session: Any,
     topic: str,
+    coalesce: bool = False,
 ) -> threading.Thread:
 
     t = threading.Thread(
@@ -88,6 +229,7 @@ def start_sis_join_subscriber(
             topic=topic,
             sender=sender,
             shutdown_event=shutdown_event,
+            coalesce=coalesce,
         ),
         daemon=True,
     )
@@ -0,0 +1,137 @@
+from __future__ import annotations
+from enum import Enum
+from inspect import isclass
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+from pycdr2 import IdlStruct
+from pycdr2._type_normalize import get_extended_type_hints
+from pycdr2.types import array, typedef, uint8, _type_code_align_size_default_mapping
+
+from ..serialization.error import MessageError
+
+# NumPy dtypes for the IdlStruct schema types, so batches of poses, calibrations, timestamps etc.
+# can live in contiguous structured arrays. Nested structs map to nested dtypes, arrays to
+# subarrays and enums to their uint32 value; e.g. RigidTransform gives
+# [('translation', [('x', '<f8'), ('y', '<f8'), ('z', '<f8')]), ('rotation', [(x, y, z, w)])].
+
+_DTYPES: Dict[type, np.dtype] = {}
+_TO_ROW: Dict[type, Callable[[Any], tuple]] = {}
+_FROM_ROW: Dict[type, Callable[[tuple], Any]] = {}
+
+
+def _unwrap(_type: Any) -> Any:
+    while isinstance(_type, typedef):
+        _type = _type.subtype
+    return _type
+
+
+def _member_dtype(_type: Any, allow_objects: bool) -> Any:
+    _type = _unwrap(_type)
+    if _type in _type_code_align_size_default_mapping:
+        return "<" + _type_code_align_size_default_mapping[_type][0]
+    if isclass(_type) and issubclass(_type, Enum):
+        return "<u4"
+    if isclass(_type) and issubclass(_type, IdlStruct):
+        return numpy_dtype(_type, allow_objects)
+    if isinstance(_type, array):
+        return (_member_dtype(_type.subtype, allow_objects), (_type.length,))
+    if allow_objects:
+        return object  # strings, bytes, sequences, unions
+    raise MessageError(MessageError.UNKNOWN_REPRESENTATION, f"{_type} has no fixed-size dtype")
+
+
+def numpy_dtype(cls: Any, allow_objects: bool = False) -> np.dtype:
+    # dtype of a fixed-size IdlStruct; with allow_objects variable-size members become object fields
+    if not allow_objects and cls in _DTYPES:
+        return _DTYPES[cls]
+    if not (isclass(cls) and issubclass(cls, IdlStruct)):
+        raise MessageError(MessageError.UNKNOWN_REPRESENTATION, f"{cls} is not an IdlStruct")
+    dtype = np.dtype([(name, _member_dtype(ftype, allow_objects)) for name, ftype in get_extended_type_hints(cls).items()])
+    if not allow_objects:
+        _DTYPES[cls] = dtype
+    return dtype
+
+
+def is_fixed_size(cls: Any) -> bool:
+    try:
+        numpy_dtype(cls)
+    except MessageError:
+        return False
+    return True
+
+
+def _enum_value(value: Any) -> int:
+    return value if type(value) is int else value.value
+
+
+class _Expressions:
+    # Builds the source of `lambda m: <row tuple>` and `lambda r: <instance>` for one struct type
+    def __init__(self):
+        self.namespace: Dict[str, Any] = {"_enum_value": _enum_value}
+
+    def constant(self, value: Any) -> str:
+        name = f"_c{len(self.namespace)}"
+        self.namespace[name] = value
+        return name
+
+    def to_row(self, _type: Any, src: str) -> str:
+        _type = _unwrap(_type)
+        if isclass(_type) and issubclass(_type, Enum):
+            return f"_enum_value({src})"
+        if isclass(_type) and issubclass(_type, IdlStruct):
+            fields = get_extended_type_hints(_type)
+            return f"({''.join(self.to_row(ftype, f'{src}.{name}') + ', ' for name, ftype in fields.items())})"
+        if isinstance(_type, array) and _unwrap(_type.subtype) == uint8:
+            return f"tuple({src})"  # byte arrays decode as bytes, which NumPy will not spread over a subarray
+        if isinstance(_type, array) and _unwrap(_type.subtype) not in _type_code_align_size_default_mapping:
+            return f"[{', '.join(self.to_row(_type.subtype, f'{src}[{i}]') for i in range(_type.length))}]"
+        return src
+
+    def from_row(self, _type: Any, src: str) -> str:
+        _type = _unwrap(_type)
+        if isclass(_type) and issubclass(_type, Enum):
+            members = self.constant({m.value: m for m in _type})
+            return f"{members}.get({src}, {src})"
+        if isclass(_type) and issubclass(_type, IdlStruct):
+            fields = get_extended_type_hints(_type)
+            values = ", ".join(f"{name}={self.from_row(ftype, f'{src}[{i}]')}" for i, (name, ftype) in enumerate(fields.items()))
+            return f"{self.constant(_type)}({values})"
+        # Subarrays come out of tolist() as ndarrays
+        if isinstance(_type, array) and _unwrap(_type.subtype) == uint8:
+            return f"bytes({src})"  # matches what pycdr2 decodes for uint8 arrays
+        if isinstance(_type, array) and _unwrap(_type.subtype) in _type_code_align_size_default_mapping:
+            return f"{src}.tolist()"
+        if isinstance(_type, array):
+            return f"[{self.from_row(_type.subtype, '_e')} for _e in {src}.tolist()]"
+        return src
+
+    def compile(self, expression: str) -> Callable:
+        return eval(f"lambda x: {expression}", self.namespace)
+
+
+def _row_converters(cls: type) -> None:
+    numpy_dtype(cls)  # raises for types without a fixed-size dtype
+    to_row, from_row = _Expressions(), _Expressions()
+    _TO_ROW[cls] = to_row.compile(to_row.to_row(cls, "x"))
+    _FROM_ROW[cls] = from_row.compile(from_row.from_row(cls, "x"))
+
+
+def to_structured_array(items: Sequence[Any], cls: Optional[type] = None) -> np.ndarray:
+    # Instances of a fixed-size IdlStruct -> structured array (cls defaults to the type of items[0])
+    if cls is None:
+        if not items:
+            raise MessageError(MessageError.MISSING_INFORMATION, "Element type of an empty sequence is unknown")
+        cls = type(items[0])
+    if cls not in _TO_ROW:
+        _row_converters(cls)
+    to_row = _TO_ROW[cls]
+    return np.array([to_row(item) for item in items], dtype=numpy_dtype(cls))
+
+
+def from_structured_array(records: np.ndarray, cls: type) -> List[Any]:
+    # Structured array (e.g. from to_structured_array or decode_many) -> instances of cls
+    if cls not in _FROM_ROW:
+        _row_converters(cls)
+    from_row = _FROM_ROW[cls]
+    return [from_row(row) for row in np.asarray(records).astype(numpy_dtype(cls), copy=False).tolist()]
@@ -0,0 +1,5 @@
+from .batch import decode_many
+from .cdr_serialization import decode_fields, encode_into, encoded_size, set_decode_cache
+from .decode_cache import DecodeCache, DecodeCacheStats
+from .validation import PayloadCheck, RejectLog, decode_checked, validate_payload
+from .compression import PayloadCodec, available_payload_codecs, compress_payload, decompress_payload, register_payload_codec
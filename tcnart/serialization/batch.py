@@ -0,0 +1,131 @@
+from __future__ import annotations
+from enum import Enum
+from inspect import isclass
+from typing import Any, Callable, Dict, Optional, Sequence, Tuple, Union
+
+import numpy as np
+from pycdr2 import IdlStruct
+from pycdr2.types import array, typedef, _type_code_align_size_default_mapping
+
+from ..schema.dtypes import numpy_dtype
+from .cdr_serialization import _TYPE_REGISTRY
+from .error import MessageError
+from .struct_codec import HEADER_LE, UnsupportedType, build_row_decoder, struct_fields
+
+# Batch decoding of many payloads of one type into a NumPy structured array, one record per
+# payload. Fixed-layout types are read straight from the concatenated payloads through a dtype
+# that mirrors the CDR layout; other types go through a generated row decoder (plain tuples,
+# no dataclass instances) with strings and sequences stored in object fields.
+
+
+def _unwrap(_type: Any) -> Any:
+    while isinstance(_type, typedef):
+        _type = _type.subtype
+    return _type
+
+
+def message_dtype(cls: Any) -> np.dtype:
+    # One field per member; nested structs become nested dtypes, enums their uint32 value
+    return numpy_dtype(cls, allow_objects=True)
+
+
+def _align(pos: int, alignment: int) -> int:
+    alignment = min(alignment, 8)
+    return (pos + alignment - 1) & ~(alignment - 1)
+
+
+def _wire_layout(_type: Any, pos: int) -> Tuple[Any, int, int]:
+    # (dtype, start, end) of a fixed-size member placed at `pos` bytes after the CDR header
+    _type = _unwrap(_type)
+    if _type in _type_code_align_size_default_mapping:
+        code, alignment, size, _ = _type_code_align_size_default_mapping[_type]
+        start = _align(pos, alignment)
+        return "<" + code, start, start + size
+    if isclass(_type) and issubclass(_type, Enum):
+        start = _align(pos, 4)
+        return "<u4", start, start + 4
+    if isclass(_type) and issubclass(_type, IdlStruct):
+        names, formats, offsets = [], [], []
+        end = pos
+        for name, ftype in struct_fields(_type).items():
+            dtype, start, end = _wire_layout(ftype, end)
+            names.append(name)
+            formats.append(dtype)
+            offsets.append(start)
+        start = offsets[0] if offsets else pos
+        offsets = [offset - start for offset in offsets]
+        return np.dtype({"names": names, "formats": formats, "offsets": offsets, "itemsize": end - start}), start, end
+    if isinstance(_type, array):
+        first, start, end = _wire_layout(_type.subtype, pos)
+        stride = end - start
+        # Struct elements must all share one layout (their padding depends on the start offset)
+        for i in range(1, _type.length):
+            dtype, elem_start, end = _wire_layout(_type.subtype, end)
+            if dtype != first or elem_start != start + i * stride:
+                raise UnsupportedType(f"{_type} has no uniform element layout")
+        return (first, (_type.length,)), start, end
+    raise UnsupportedType(f"{_type} has no fixed size")
+
+
+def wire_dtype(cls: Any) -> Optional[np.dtype]:
+    # dtype matching a whole little-endian XCDR1 payload (header included) of a fixed-size type
+    try:
+        dtype, _, end = _wire_layout(cls, 0)
+    except UnsupportedType:
+        return None
+    fields = [(name, *dtype.fields[name][:2]) for name in dtype.names]
+    return np.dtype({
+        "names": [f[0] for f in fields],
+        "formats": [f[1] for f in fields],
+        "offsets": [f[2] + len(HEADER_LE) for f in fields],
+        "itemsize": end + len(HEADER_LE),
+    })
+
+
+class _BatchDecoder:
+    def __init__(self, cls: Any):
+        self.cls = cls
+        self.dtype = message_dtype(cls)
+        self.wire = wire_dtype(cls)
+        self.row: Optional[Callable[[Any], tuple]] = build_row_decoder(cls)
+
+    def decode_fixed(self, payloads: Sequence[Any]) -> Optional[np.ndarray]:
+        size = self.wire.itemsize
+        if any(len(p) != size for p in payloads):
+            return None
+        data = b"".join(payloads)
+        headers = np.frombuffer(data, dtype=np.uint8).reshape(len(payloads), size)[:, :len(HEADER_LE)]
+        if not (headers == np.frombuffer(HEADER_LE, dtype=np.uint8)).all():
+            return None
+        return np.frombuffer(data, dtype=self.wire).astype(self.dtype)
+
+    def decode_rows(self, payloads: Sequence[Any]) -> np.ndarray:
+        if self.row is None:
+            raise MessageError(MessageError.UNKNOWN_REPRESENTATION, f"{self.cls.__name__} cannot be decoded in batch")
+        out = np.empty(len(payloads), dtype=self.dtype)
+        for i, payload in enumerate(payloads):
+            out[i] = self.row(payload)
+        return out
+
+
+_DECODERS: Dict[Any, _BatchDecoder] = {}
+
+
+def decode_many(type_name: Union[str, type], payloads: Sequence[Any]) -> np.ndarray:
+    # type_name is a registered schema name or an IdlStruct class (e.g. RigidTransform)
+    cls = _TYPE_REGISTRY.get(type_name) if isinstance(type_name, str) else type_name
+    if not (isclass(cls) and issubclass(cls, IdlStruct)):
+        raise MessageError(MessageError.MISSING_INFORMATION, f"No IdlStruct registered for {type_name}")
+    decoder = _DECODERS.get(cls)
+    if decoder is None:
+        decoder = _DECODERS[cls] = _BatchDecoder(cls)
+    try:
+        if decoder.wire is not None:
+            result = decoder.decode_fixed(payloads)
+            if result is not None:
+                return result
+        return decoder.decode_rows(payloads)
+    except MessageError:
+        raise
+    except Exception as e:
+        raise MessageError(MessageError.DECODING_ERROR, str(e))
@@ -1,7 +1,9 @@
 from __future__ import annotations
-from typing import Tuple, Dict, Type, Any
+from dataclasses import fields as dataclass_fields, is_dataclass
+from typing import Tuple, Dict, Type, Any, Callable, FrozenSet, Iterable, Optional
 
 from .error import MessageError
+from .struct_codec import HEADER_LE, StructCodec, build_projection, build_struct_codec
 from ..schema.messages.common import InvalidMessage
 
 import pycdr2
@@ -10,19 +12,53 @@ MIN_PAYLOAD_SIZE = 4
 
 # Registry for schema type name -> Python class factory
 _TYPE_REGISTRY: Dict[str, Any] = {}
+# Generated struct codecs for registered IdlStructs, by schema name and by class
+_CODECS: Dict[str, StructCodec] = {}
+_CODECS_BY_CLASS: Dict[type, StructCodec] = {}
+# Generated field projections by (schema name, field names); None where only full decoding works
+_PROJECTIONS: Dict[Tuple[str, FrozenSet[str]], Optional[Callable[[Any], Dict[str, Any]]]] = {}
+_DECODE_CACHE: Any = None
 
 
 def register_type(name: str, cls: Any) -> None:
     _TYPE_REGISTRY[name] = cls
+    codec = build_struct_codec(cls)
+    if codec is not None:
+        _CODECS[name] = codec
+        _CODECS_BY_CLASS[cls] = codec
 
 
-def decode_raw_message(type_name: str, payload: bytes) -> Any:
+def set_decode_cache(cache: Any) -> None:
+    # Opt into caching decoded messages (a decode_cache.DecodeCache, or None to switch it off)
+    global _DECODE_CACHE
+    _DECODE_CACHE = cache
+
+
+def decode_raw_message(type_name: str, payload: bytes, blob: Optional[Callable[[memoryview], Any]] = None) -> Any:
+    # blob, if given, receives every uint8 sequence member (see StructCodec.decode_blobs); such
+    # messages own their buffers, so they bypass the decode cache
+    cache = _DECODE_CACHE
+    if cache is not None and blob is None:
+        return cache.decode(type_name, payload)
+    return _decode_message(type_name, payload, blob)
+
+
+def _decode_message(type_name: str, payload: bytes, blob: Optional[Callable[[memoryview], Any]] = None) -> Any:
     # lookup target class
     cls = _TYPE_REGISTRY.get(type_name)
     if cls is None:
         # fall back to InvalidMessage
         return InvalidMessage()
 
+    codec = _CODECS.get(type_name)
+    if codec is not None:
+        try:
+            if blob is not None:
+                return codec.decode_blobs(payload, blob)
+            return codec.decode(payload)
+        except Exception as e:
+            raise MessageError(MessageError.DECODING_ERROR, str(e))
+
     # pycdr2 usage placeholder; requires IDL/type definitions to fully decode.
     # We provide an extension point for classes to implement classmethod from_cdr(buffer: bytes, endianness: str) -> Any
     if hasattr(cls, "deserialize") and callable(getattr(cls, "deserialize")):
@@ -34,8 +70,47 @@ def decode_raw_message(type_name: str, payload: bytes) -> Any:
     return InvalidMessage()
 
 
+def decode_fields(type_name: str, payload: bytes, fields: Iterable[str]) -> Dict[str, Any]:
+    # Decode only the named top-level members, e.g. decode_fields(name, payload, ["header", "pose"]).
+    # Unwanted members are stepped over by their size or length prefix (an image or calibration
+    # blob is never copied) and parsing stops after the last requested member.
+    cls = _TYPE_REGISTRY.get(type_name)
+    if cls is None:
+        raise MessageError(MessageError.MISSING_INFORMATION, f"Unknown schema type {type_name}")
+    names = list(dict.fromkeys(fields))
+    if not names:
+        return {}
+    key = (type_name, frozenset(names))
+    if key not in _PROJECTIONS:
+        members = {f.name for f in dataclass_fields(cls)} if is_dataclass(cls) else set(names)
+        unknown = [name for name in names if name not in members]
+        if unknown:
+            raise MessageError(MessageError.MISSING_INFORMATION, f"{type_name} has no fields {unknown}")
+        _PROJECTIONS[key] = build_projection(cls, names)
+    project = _PROJECTIONS[key]
+
+    try:
+        if project is not None and payload[:4] == HEADER_LE:
+            return project(payload)
+    except Exception as e:
+        raise MessageError(MessageError.DECODING_ERROR, str(e))
+    # Types or encodings the generator does not cover: full decode, then pick the members
+    message = decode_raw_message(type_name, payload)
+    try:
+        return {name: getattr(message, name) for name in names}
+    except AttributeError as e:
+        raise MessageError(MessageError.MISSING_INFORMATION, str(e))
+
+
 def encode_raw_message(message: Any, type_name: str | None = None) -> bytes:
 
+    codec = _CODECS_BY_CLASS.get(type(message))
+    if codec is not None:
+        try:
+            return codec.encode(message)
+        except Exception as e:
+            raise MessageError(MessageError.DECODING_ERROR, str(e))
+
     # Allow message to provide its own encoder
     if hasattr(message, "serialize") and callable(getattr(message, "serialize")):
         try:
@@ -48,6 +123,34 @@ def encode_raw_message(message: Any, type_name: str | None = None) -> bytes:
     raise MessageError(MessageError.DECODING_ERROR, "No serialize() provided and no raw CDR payload available")
 
 
+def encoded_size(message: Any) -> int:
+    # Exact payload size, computed without serializing for types with a generated codec
+    codec = _CODECS_BY_CLASS.get(type(message))
+    if codec is not None:
+        try:
+            return codec.encoded_size(message)
+        except Exception as e:
+            raise MessageError(MessageError.DECODING_ERROR, str(e))
+    return len(encode_raw_message(message))
+
+
+def encode_into(message: Any, buffer: Any, offset: int = 0) -> int:
+    # Serialize into a caller-owned writable buffer (reused bytearray, numpy array, SHM view)
+    # starting at offset; returns the number of bytes written.
+    codec = _CODECS_BY_CLASS.get(type(message))
+    if codec is not None:
+        try:
+            return codec.encode_into(message, buffer, offset)
+        except Exception as e:
+            raise MessageError(MessageError.DECODING_ERROR, str(e))
+    payload = encode_raw_message(message)
+    view = memoryview(buffer).cast("B")
+    if offset < 0 or offset + len(payload) > len(view):
+        raise MessageError(MessageError.DECODING_ERROR, f"Buffer too small: {len(view) - offset} < {len(payload)} bytes")
+    view[offset:offset + len(payload)] = payload
+    return len(payload)
+
+
 def get_message_schema_name(message: Any) -> str:
     # Mirror Rust get_message_schema_name for known wrapper types
     from ..schema.model import MessageSchema
@@ -0,0 +1,174 @@
+from __future__ import annotations
+import lzma
+import os
+import struct
+import threading
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .error import MessageError
+
+try:
+    import zstandard  # optional, much faster than zlib at similar ratios
+except ImportError:
+    zstandard = None
+try:
+    import lz4.frame as lz4_frame  # optional, fastest, lower ratio
+except ImportError:
+    lz4_frame = None
+
+# Transport compression of serialized payloads, for raw image/depth streams routed off-host.
+# The codec name travels in the attachment after the schema name ("<type>;zlib"), so receivers
+# decompress transparently and plain payloads keep their plain attachment.
+# Payloads are cut into chunks compressed/decompressed in parallel on a shared thread pool
+# (zlib, lzma, zstd and lz4 all release the GIL). Frame layout, little-endian:
+#   uint32 chunk count, per chunk (uint32 raw size, uint32 stored size), then the chunk data.
+# A chunk whose stored size equals its raw size is stored uncompressed. Every chunk but the last
+# holds CHUNK_SIZE raw bytes; frames breaking that or claiming more than MAX_PAYLOAD_SIZE raw
+# bytes are rejected before anything is decompressed.
+
+ATTACHMENT_SEPARATOR = ";"
+CHUNK_SIZE = 1 << 20
+MIN_COMPRESSED_SIZE = 1 << 16  # smaller payloads are sent as they are
+MAX_PAYLOAD_SIZE = 1 << 30
+
+_COUNT = struct.Struct("<I")
+_CHUNK = struct.Struct("<II")
+
+
+@dataclass(frozen=True)
+class PayloadCodec:
+    name: str
+    compress: Callable[[Any], bytes]
+    decompress: Callable[[Any, int], bytes]  # (data, raw size); must not return more than raw size
+
+
+def _zlib_decompress(data: Any, size: int) -> bytes:
+    return zlib.decompressobj().decompress(data, size)
+
+
+def _lzma_decompress(data: Any, size: int) -> bytes:
+    return lzma.LZMADecompressor().decompress(data, max_length=size)
+
+
+def _lz4_decompress(data: Any, size: int) -> bytes:
+    return lz4_frame.LZ4FrameDecompressor().decompress(data, max_length=size)
+
+
+_PAYLOAD_CODECS: Dict[str, PayloadCodec] = {}
+
+
+def register_payload_codec(codec: PayloadCodec) -> None:
+    _PAYLOAD_CODECS[codec.name] = codec
+
+
+def payload_codec(name: str) -> PayloadCodec:
+    codec = _PAYLOAD_CODECS.get(name)
+    if codec is None:
+        raise MessageError(MessageError.UNKNOWN_REPRESENTATION, f"Payload codec {name!r} is not available")
+    return codec
+
+
+def available_payload_codecs() -> List[str]:
+    return list(_PAYLOAD_CODECS)
+
+
+register_payload_codec(PayloadCodec("zlib", lambda data: zlib.compress(data, 1), _zlib_decompress))
+register_payload_codec(PayloadCodec("lzma", lambda data: lzma.compress(data, preset=0), _lzma_decompress))
+if zstandard is not None:
+    register_payload_codec(PayloadCodec(
+        "zstd",
+        lambda data: zstandard.ZstdCompressor(level=1).compress(data),
+        lambda data, size: zstandard.ZstdDecompressor().decompress(data, max_output_size=size),
+    ))
+if lz4_frame is not None:
+    register_payload_codec(PayloadCodec("lz4", lz4_frame.compress, _lz4_decompress))
+
+
+_POOL: Optional[ThreadPoolExecutor] = None
+_POOL_LOCK = threading.Lock()
+
+
+def _pool() -> ThreadPoolExecutor:
+    global _POOL
+    if _POOL is None:
+        with _POOL_LOCK:
+            if _POOL is None:
+                _POOL = ThreadPoolExecutor(max_workers=min(8, os.cpu_count() or 1), thread_name_prefix="tcnart-codec")
+    return _POOL
+
+
+def _map(fn: Callable, items: List[Any]) -> List[Any]:
+    if len(items) == 1:
+        return [fn(items[0])]
+    return list(_pool().map(fn, items))
+
+
+def compress_payload(name: str, payload: Any) -> bytes:
+    codec = payload_codec(name)
+    view = memoryview(payload).cast("B")
+    if len(view) > MAX_PAYLOAD_SIZE:
+        raise MessageError(MessageError.INVALID_PAYLOAD, f"{len(view)} byte payload exceeds {MAX_PAYLOAD_SIZE} bytes")
+    chunks = [view[i:i + CHUNK_SIZE] for i in range(0, len(view), CHUNK_SIZE)]
+
+    def compress(chunk: memoryview) -> Any:
+        packed = codec.compress(chunk)
+        return packed if len(packed) < len(chunk) else chunk
+
+    stored = _map(compress, chunks)
+    header = bytearray(_COUNT.pack(len(chunks)))
+    for chunk, data in zip(chunks, stored):
+        header += _CHUNK.pack(len(chunk), len(data))
+    return b"".join([header, *stored])
+
+
+def decompress_payload(name: str, frame: Any) -> bytes:
+    codec = payload_codec(name)
+    view = memoryview(frame).cast("B")
+    try:
+        count, = _COUNT.unpack_from(view, 0)
+        pos = _COUNT.size + count * _CHUNK.size
+        if pos > len(view):
+            raise ValueError(f"{count} chunks do not fit a {len(view)} byte frame")
+        if count > -(-MAX_PAYLOAD_SIZE // CHUNK_SIZE):
+            raise ValueError(f"{count} chunks exceed the {MAX_PAYLOAD_SIZE} byte payload limit")
+        jobs: List[Tuple[int, memoryview]] = []
+        for index, (raw, size) in enumerate(_CHUNK.iter_unpack(view[_COUNT.size:pos])):
+            if raw > CHUNK_SIZE or (raw != CHUNK_SIZE and index != count - 1):
+                raise ValueError(f"Chunk {index} claims {raw} raw bytes")
+            if size > raw:
+                raise ValueError(f"Chunk {index} stores {size} bytes for {raw} raw bytes")
+            jobs.append((raw, view[pos:pos + size]))
+            pos += size
+        if pos != len(view):
+            raise ValueError(f"Chunk sizes add up to {pos}, frame has {len(view)} bytes")
+    except (struct.error, ValueError) as e:
+        raise MessageError(MessageError.INVALID_PAYLOAD, f"Malformed {name} frame: {e}")
+
+    def decompress(job: Tuple[int, memoryview]) -> Any:
+        raw, data = job
+        if len(data) == raw:
+            return data
+        out = codec.decompress(data, raw)
+        if len(out) != raw:
+            raise MessageError(MessageError.INVALID_PAYLOAD, f"{name} chunk decompressed to {len(out)} instead of {raw} bytes")
+        return out
+
+    try:
+        return b"".join(_map(decompress, jobs))
+    except MessageError:
+        raise
+    except Exception as e:
+        raise MessageError(MessageError.DECODING_ERROR, f"{name}: {e}")
+
+
+def split_attachment(attachment: str) -> Tuple[str, Optional[str]]:
+    # "<type>;<codec>" -> (type, codec); plain schema names -> (name, None)
+    type_name, _, codec = attachment.partition(ATTACHMENT_SEPARATOR)
+    return type_name, codec or None
+
+
+def join_attachment(type_name: str, codec: Optional[str]) -> str:
+    return f"{type_name}{ATTACHMENT_SEPARATOR}{codec}" if codec else type_name
@@ -0,0 +1,160 @@
+from __future__ import annotations
+import hashlib
+import threading
+from collections import OrderedDict
+from dataclasses import FrozenInstanceError, dataclass, fields, is_dataclass
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from .cdr_serialization import _decode_message, _CODECS_BY_CLASS
+
+# Control-plane messages that are re-published unchanged (descriptors, presence, SIS joins,
+# device context replies): worth caching, unlike per-frame video/mesh payloads.
+CONTROL_MESSAGE_TYPES = frozenset({
+    "tcnart_msgs::msg::StreamDescriptorMessage",
+    "tcnart_msgs::msg::TcnartPresenceMessage",
+    "tcnart_msgs::msg::SISJoinMessage",
+    "pcpd_msgs::msg::CameraSensor",
+    "pcpd_msgs::rpc::DeviceContextReply",
+})
+
+
+class FrozenMessage:
+    # Mixin for the read-only variants of message dataclasses handed out by the cache: the same
+    # instance is shared by every consumer, so sequences become tuples and assignment raises.
+    # Pickles as the plain (mutable) message type; constructing one (e.g. dataclasses.replace)
+    # builds the plain message and freezes its values.
+    __slots__ = ()
+    _thawed_type: type = object
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        _set_frozen_fields(self, self._thawed_type(*args, **kwargs))
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise FrozenInstanceError(f"cannot assign to field {name!r} of a cached message")
+
+    def __delattr__(self, name: str) -> None:
+        raise FrozenInstanceError(f"cannot delete field {name!r} of a cached message")
+
+    def __eq__(self, other: Any) -> bool:
+        # Equal to the plain message with the same values (lists and tuples alike)
+        if not isinstance(other, self._thawed_type):
+            return NotImplemented
+        return all(_frozen_equal(getattr(self, f.name), getattr(other, f.name)) for f in fields(self))
+
+    __hash__ = None
+
+    def __reduce__(self):
+        return _thaw_fields, (self._thawed_type, {f.name: getattr(self, f.name) for f in fields(self)})
+
+
+def _frozen_equal(frozen: Any, other: Any) -> bool:
+    if isinstance(frozen, tuple) and isinstance(other, (list, tuple)):
+        if len(frozen) != len(other):
+            return False
+        if frozen and isinstance(frozen[0], tuple):
+            return all(_frozen_equal(a, b) for a, b in zip(frozen, other))
+        return frozen == tuple(other)  # elements that are frozen messages compare via __eq__ above
+    return frozen == other
+
+
+_FROZEN_TYPES: Dict[type, type] = {}
+
+
+def _frozen_type(cls: type) -> type:
+    frozen = _FROZEN_TYPES.get(cls)
+    if frozen is None:
+        namespace = {"_thawed_type": cls}
+        if hasattr(cls, "__idl_typename__"):
+            namespace["__idl_typename__"] = cls.__idl_typename__  # keep the IDL type name for serialize()
+        frozen = _FROZEN_TYPES[cls] = type(cls)(f"Frozen{cls.__name__}", (FrozenMessage, cls), namespace)
+        if cls in _CODECS_BY_CLASS:
+            _CODECS_BY_CLASS[frozen] = _CODECS_BY_CLASS[cls]
+    return frozen
+
+
+def freeze_message(value: Any) -> Any:
+    if isinstance(value, FrozenMessage):
+        return value
+    if is_dataclass(value) and not isinstance(value, type):
+        frozen = object.__new__(_frozen_type(type(value)))
+        _set_frozen_fields(frozen, value)
+        return frozen
+    if isinstance(value, list):
+        # Sequences are homogeneous: primitive ones (e.g. a calibration blob) are copied in one go
+        if not value or not (is_dataclass(value[0]) or isinstance(value[0], list)):
+            return tuple(value)
+        return tuple(freeze_message(v) for v in value)
+    return value
+
+
+def _set_frozen_fields(frozen: FrozenMessage, value: Any) -> None:
+    for f in fields(value):
+        object.__setattr__(frozen, f.name, freeze_message(getattr(value, f.name)))
+
+
+def thaw_message(value: Any) -> Any:
+    # Mutable deep copy of a frozen message (lists restored)
+    if isinstance(value, FrozenMessage):
+        return _thaw_fields(value._thawed_type, {f.name: getattr(value, f.name) for f in fields(value)})
+    if isinstance(value, tuple):
+        if not value or not isinstance(value[0], (FrozenMessage, tuple)):
+            return list(value)
+        return [thaw_message(v) for v in value]
+    return value
+
+
+def _thaw_fields(cls: type, values: Dict[str, Any]) -> Any:
+    return cls(**{name: thaw_message(v) for name, v in values.items()})
+
+
+@dataclass
+class DecodeCacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    bypassed: int = 0  # payloads of uncached types or larger than max_payload_size
+
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class DecodeCache:
+    # Bounded LRU of decoded messages keyed by (type name, payload digest). Opt in with
+    # set_decode_cache(DecodeCache()); decode_raw_message then returns shared frozen instances.
+    def __init__(self, max_entries: int = 256, max_payload_size: int = 1 << 20,
+                 type_names: Optional[Iterable[str]] = CONTROL_MESSAGE_TYPES):
+        self.max_entries = int(max_entries)
+        self.max_payload_size = int(max_payload_size)
+        self.type_names = None if type_names is None else frozenset(type_names)  # None caches every type
+        self.stats = DecodeCacheStats()
+        self._entries: "OrderedDict[Tuple[str, bytes], Any]" = OrderedDict()
+        self._lock = threading.Lock()  # shared by all receiver threads
+
+    def decode(self, type_name: str, payload: Any) -> Any:
+        if (self.type_names is not None and type_name not in self.type_names) or len(payload) > self.max_payload_size:
+            with self._lock:
+                self.stats.bypassed += 1
+            return _decode_message(type_name, payload)
+        key = (type_name, hashlib.blake2b(payload, digest_size=16).digest())
+        with self._lock:
+            message = self._entries.get(key)
+            if message is not None:
+                self._entries.move_to_end(key)
+                self.stats.hits += 1
+                return message
+            self.stats.misses += 1
+        message = freeze_message(_decode_message(type_name, payload))
+        with self._lock:
+            self._entries[key] = message
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.stats.evictions += 1
+        return message
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,551 @@
+from __future__ import annotations
+import logging
+import struct
+from enum import Enum
+from inspect import isclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+from pycdr2 import IdlStruct
+from pycdr2._type_helper import get_args, get_origin
+from pycdr2._type_normalize import get_extended_type_hints, get_idl_annotations
+from pycdr2.types import array, bounded_str, sequence, typedef, uint8, _type_code_align_size_default_mapping
+
+log = logging.getLogger(__name__)
+
+# Specialised CDR codecs generated from the IdlStruct annotations. Consecutive fixed-size members
+# are packed into one precompiled struct.Struct with the CDR (XCDR1) padding baked in as 'x' bytes,
+# so e.g. a RigidTransform is a single unpack_from instead of seven reflective machine calls.
+# Only little-endian XCDR1 payloads are decoded here; anything else is handed back to pycdr2.
+# In row mode the same generator decodes to plain tuples instead (nested structs as nested
+# tuples, enums as ints, primitive sequences as NumPy arrays) for filling structured arrays.
+# Members emitted while `skipping` is set are stepped over by their size or length prefix
+# without being read, which is how projections decode only some fields.
+# In blob mode the decode functions take a third argument, blob, which receives every uint8
+# sequence as a memoryview of the payload and returns its decoded value (e.g. a pooled buffer).
+
+HEADER_LE = b"\x00\x01\x00\x00"  # encapsulation header written by pycdr2 on little-endian hosts
+_MAX_ALIGN = 8  # XCDR1 caps alignment at 8 bytes
+_PAD = tuple(b"\0" * n for n in range(_MAX_ALIGN))
+
+
+class UnsupportedType(Exception):
+    pass
+
+
+def _enum_value(value: Any) -> int:
+    return value if type(value) is int else value.value
+
+
+def _byte_array(value: Any, length: int) -> bytes:
+    data = bytes(value)
+    if len(data) != length:
+        raise ValueError("Incorrectly sized array.")
+    return data
+
+
+def _byte_source(value: Any) -> Any:
+    # Buffer for a uint8 sequence that can be slice-assigned into the output without a copy
+    if isinstance(value, (bytes, bytearray)):
+        return value
+    if isinstance(value, np.ndarray):
+        return memoryview(np.ascontiguousarray(value, dtype=np.uint8).reshape(-1))
+    return bytes(value)
+
+
+def _byte_len(value: Any) -> int:
+    return value.size if isinstance(value, np.ndarray) else len(value)
+
+
+def _utf8_len(value: str) -> int:
+    return len(value) if value.isascii() else len(value.encode("utf-8"))
+
+
+def _tuple(values: Any) -> str:
+    return f"({''.join(f'{value}, ' for value in values)})"
+
+
+class _Body:
+    # Code for one generated decode/encode/write/size function set. `known`/`off` track what is
+    # statically known about the position: (pos - 4) % known == off. Fixed members whose alignment
+    # is within `known` join the current run; anything else ends the run and aligns at runtime.
+    # encode appends to a bytearray (cheapest for small messages); write fills a presized buffer.
+    def __init__(self, builder: "_Builder", known: int):
+        self.builder = builder
+        self.dec: List[str] = []
+        self.enc: List[str] = []
+        self.wr: List[str] = []
+        self.sz: List[str] = []
+        self.known = known
+        self.off = 0
+        self.skipping = False
+        self._fmt: List[str] = []
+        self._targets: List[str] = []
+        self._values: List[str] = []
+        self._size = 0
+
+    def local(self) -> str:
+        return self.builder.name("_v")
+
+    def align(self, alignment: int) -> None:
+        alignment = min(alignment, _MAX_ALIGN)
+        if alignment <= self.known:
+            pad = -self.off % alignment
+            if pad:
+                self._fmt.append(f"{pad}x")
+                self._size += pad
+                self.off = (self.off + pad) % self.known
+            return
+        self.flush()
+        self.dynamic_align(alignment)
+        self.known, self.off = alignment, 0
+
+    def dynamic_align(self, alignment: int, indent: str = "") -> None:
+        self.dec.append(f"{indent}p += (4 - p) & {alignment - 1}")
+        self.enc.append(f"{indent}out += _PAD[(4 - len(out)) & {alignment - 1}]")
+        self.sz.append(f"{indent}p += (4 - p) & {alignment - 1}")
+        self.wr.append(f"{indent}_n = (4 - p) & {alignment - 1}")
+        self.wr.append(f"{indent}buf[p:p + _n] = _PAD[_n]")
+        self.wr.append(f"{indent}p += _n")
+
+    def take(self, fmt: str, alignment: int, size: int, count: int, value: str, needed: bool = False) -> List[str]:
+        # Append `count` values of `size` bytes in total to the current run; length prefixes
+        # are `needed` even while skipping
+        self.align(alignment)
+        if self.skipping and not needed:
+            self._fmt.append(f"{size}x")
+            self._size += size
+            self.off = (self.off + size) % self.known
+            return ["None"] * count
+        targets = [self.local() for _ in range(count)]
+        self._fmt.append(fmt)
+        self._targets.extend(targets)
+        self._values.append(value)
+        self._size += size
+        self.off = (self.off + size) % self.known
+        return targets
+
+    def flush(self) -> None:
+        if not self._fmt:
+            return
+        if self._targets or self._values:
+            packer = self.builder.struct("<" + "".join(self._fmt))
+            if self._targets:
+                self.dec.append(f"{', '.join(self._targets)}, = {packer}.unpack_from(buf, p)")
+            self.enc.append(f"out += {packer}.pack({', '.join(self._values)})")
+            self.wr.append(f"{packer}.pack_into(buf, p, {', '.join(self._values)})")
+        for lines in (self.dec, self.wr, self.sz):
+            lines.append(f"p += {self._size}")
+        self._fmt, self._targets, self._values, self._size = [], [], [], 0
+
+    def unknown(self, known: int = 1) -> None:
+        # Called after variable-length data: only `known` alignment is guaranteed from here
+        self.known, self.off = known, 0
+
+    def member(self, _type: Any, src: str) -> str:
+        # Emit code for one member read from / written to `src`; returns the decoded expression
+        if isinstance(_type, typedef):
+            return self.member(_type.subtype, src)
+        if _type is str or isinstance(_type, bounded_str):
+            return self.string(src)
+        if _type is bytes:
+            return self.blob(src)
+        if _type in _type_code_align_size_default_mapping:
+            code, alignment, size, _ = _type_code_align_size_default_mapping[_type]
+            return self.take(code, alignment, size, 1, src)[0]
+        if isclass(_type) and issubclass(_type, Enum):
+            value = self.take("I", 4, 4, 1, f"_enum_value({src})")[0]
+            if self.builder.rows:
+                return value
+            members = self.builder.constant("_M", {m.value: m for m in _type})
+            return f"{members}.get({value}, {value})"
+        if isclass(_type) and issubclass(_type, IdlStruct):
+            check_struct(_type)
+            cls = self.builder.constant("_C", _type)
+            values = {name: self.member(ftype, f"{src}.{name}") for name, ftype in struct_fields(_type).items()}
+            if self.skipping:
+                return "None"
+            if self.builder.rows:
+                return _tuple(values.values())
+            return f"{cls}({', '.join(f'{name}={value}' for name, value in values.items())})"
+        if isinstance(_type, array):
+            return self.array(_type.subtype, _type.length, src)
+        if isinstance(_type, sequence):
+            return self.sequence(_type.subtype, src)
+        if get_origin(_type) == list:
+            return self.sequence(get_args(_type)[0], src)
+        raise UnsupportedType(f"{_type} is not supported by the generated codecs")
+
+    def string(self, src: str) -> str:
+        data = self.local()
+        self.enc.append(f"{data} = {src}.encode('utf-8')")
+        self.wr.append(f"{data} = {src}.encode('utf-8')")
+        length = self.take("I", 4, 4, 1, f"len({data}) + 1", needed=True)[0]
+        self.flush()
+        if self.skipping:
+            self.dec.append(f"p += {length}")
+            self.unknown()
+            return "None"
+        value = self.local()
+        self.dec.append(f"{value} = str(buf[p:p + {length} - 1], 'utf-8')")
+        self.dec.append(f"p += {length}")
+        self.enc.append(f"out += {data}")
+        self.enc.append("out += b'\\0'")
+        self.wr.append(f"buf[p:p + len({data})] = {data}")
+        self.wr.append(f"p += len({data})")
+        self.wr.append("buf[p] = 0")
+        self.wr.append("p += 1")
+        self.sz.append(f"p += _utf8_len({src}) + 1")
+        self.unknown()
+        return value
+
+    def blob(self, src: str) -> str:
+        length = self.take("I", 4, 4, 1, f"len({src})", needed=True)[0]
+        self.flush()
+        if self.skipping:
+            self.dec.append(f"p += {length}")
+            self.unknown()
+            return "None"
+        value = self.local()
+        self.dec.append(f"{value} = bytes(buf[p:p + {length}])")
+        self.dec.append(f"p += {length}")
+        self.enc.append(f"out += {src}")
+        self.wr.append(f"buf[p:p + len({src})] = {src}")
+        self.wr.append(f"p += len({src})")
+        self.sz.append(f"p += len({src})")
+        self.unknown()
+        return value
+
+    def array(self, subtype: Any, length: int, src: str) -> str:
+        while isinstance(subtype, typedef):
+            subtype = subtype.subtype
+        if subtype in _type_code_align_size_default_mapping:
+            code, alignment, size, _ = _type_code_align_size_default_mapping[subtype]
+            if subtype == uint8 and self.builder.rows:
+                return _tuple(self.take(f"{length}B", 1, length, length, f"*{src}"))
+            if subtype == uint8:
+                return self.take(f"{length}s", 1, length, 1, f"_byte_array({src}, {length})")[0]
+            values = self.take(f"{length}{code}", alignment, size * length, length, f"*{src}")
+            return f"[{', '.join(values)}]"
+        return f"[{', '.join(self.member(subtype, f'{src}[{i}]') for i in range(length))}]"
+
+    def sequence(self, subtype: Any, src: str) -> str:
+        while isinstance(subtype, typedef):
+            subtype = subtype.subtype
+        counted = src
+        if subtype == uint8:
+            counted = self.local()
+            for lines in (self.enc, self.wr):
+                lines.append(f"{counted} = _byte_source({src})")
+        count = self.take("I", 4, 4, 1, f"len({counted})", needed=True)[0]
+        self.flush()
+        value = self.local()
+        if subtype in _type_code_align_size_default_mapping:
+            code, alignment, size, _ = _type_code_align_size_default_mapping[subtype]
+            if self.skipping:
+                if alignment > 4:
+                    self.dec.append(f"if {count}:")
+                    self.dec.append(f"    p += (4 - p) & {alignment - 1}")
+                self.dec.append(f"p += {count} * {size}")
+                self.unknown(min(4, size))
+                return "None"
+            if self.builder.rows:
+                if alignment > 4:
+                    self.dec.append(f"if {count}:")
+                    self.dec.append(f"    p += (4 - p) & {alignment - 1}")
+                self.dec.append(f"{value} = _frombuffer(buf, '<{code}', {count}, p)")
+                self.dec.append(f"p += {count} * {size}")
+                self.unknown(min(4, size))
+                return value
+            if code == "B":
+                if self.builder.blobs:
+                    self.dec.append(f"{value} = blob(buf[p:p + {count}])")
+                else:
+                    self.dec.append(f"{value} = list(buf[p:p + {count}])")
+                self.dec.append(f"p += {count}")
+                self.enc.append(f"out += {counted}")
+                self.wr.append(f"buf[p:p + len({counted})] = {counted}")
+                self.wr.append(f"p += len({counted})")
+                self.sz.append(f"p += _byte_len({src})")
+                self.unknown()
+                return value
+            # Elements are only aligned when there are any (matches pycdr2)
+            if alignment > 4:
+                for lines in (self.dec, self.enc, self.wr, self.sz):
+                    lines.append(f"if len({src}):" if lines is not self.dec else f"if {count}:")
+                self.dynamic_align(alignment, indent="    ")
+            self.dec.append(f"{value} = list(_unpack_from('<%d{code}' % {count}, buf, p))")
+            self.dec.append(f"p += {count} * {size}")
+            self.enc.append(f"out += _pack('<%d{code}' % len({src}), *{src})")
+            self.wr.append(f"_pack_into('<%d{code}' % len({src}), buf, p, *{src})")
+            for lines in (self.wr, self.sz):
+                lines.append(f"p += len({src}) * {size}")
+            self.unknown(min(4, size))
+            return value
+        if isclass(subtype) and issubclass(subtype, IdlStruct) and self.skipping:
+            skip = self.builder.function(subtype, skip=True)[0]
+            self.dec.append(f"for _ in range({count}):")
+            self.dec.append(f"    p = {skip}(buf, p)[1]")
+            self.dec.append("    if p > len(buf):")
+            self.dec.append("        break")  # bogus counts must not spin through billions of elements
+            self.unknown()
+            return "None"
+        if isclass(subtype) and issubclass(subtype, IdlStruct):
+            decode, encode, write, size = self.builder.function(subtype)
+            item = self.local()
+            self.dec.append(f"{value} = []")
+            self.dec.append(f"for _ in range({count}):")
+            self.dec.append(f"    {item}, p = {decode}({self.builder.decode_args})")
+            self.dec.append(f"    {value}.append({item})")
+            self.enc.append(f"for {item} in {src}:")
+            self.enc.append(f"    {encode}(out, {item})")
+            self.wr.append(f"for {item} in {src}:")
+            self.wr.append(f"    p = {write}(buf, p, {item})")
+            self.sz.append(f"for {item} in {src}:")
+            self.sz.append(f"    p = {size}({item}, p)")
+            self.unknown()
+            return value
+        raise UnsupportedType(f"sequence of {subtype} is not supported by the generated codecs")
+
+
+class _Builder:
+    def __init__(self, rows: bool = False, blobs: bool = False):
+        self.rows = rows
+        self.blobs = blobs
+        self.decode_args = "buf, p, blob" if blobs else "buf, p"
+        self.namespace: Dict[str, Any] = {
+            "_PAD": _PAD,
+            "_frombuffer": np.frombuffer,
+            "_pack": struct.pack,
+            "_pack_into": struct.pack_into,
+            "_unpack_from": struct.unpack_from,
+            "_enum_value": _enum_value,
+            "_byte_array": _byte_array,
+            "_byte_source": _byte_source,
+            "_byte_len": _byte_len,
+            "_utf8_len": _utf8_len,
+        }
+        self.lines: List[str] = []
+        self._structs: Dict[str, str] = {}
+        self._functions: Dict[Tuple[type, int, bool], Optional[Tuple[str, str, str, str]]] = {}
+        self._count = 0
+
+    def name(self, prefix: str) -> str:
+        self._count += 1
+        return f"{prefix}{self._count}"
+
+    def constant(self, prefix: str, value: Any) -> str:
+        name = self.name(prefix)
+        self.namespace[name] = value
+        return name
+
+    def struct(self, fmt: str) -> str:
+        name = self._structs.get(fmt)
+        if name is None:
+            name = self._structs[fmt] = self.constant("_S", struct.Struct(fmt))
+        return name
+
+    def function(self, cls: type, known: int = 1, skip: bool = False) -> Tuple[str, str, str, str]:
+        # decode(buf, p) -> (obj, p), encode(out, m), write(buf, p, m) -> p and size(m, p) -> p for
+        # cls, starting at a position aligned to `known`; size returns where write would stop.
+        # With skip only a decode(buf, p) -> (None, p) that steps over the struct is generated.
+        key = (cls, known, skip)
+        if key in self._functions:
+            names = self._functions[key]
+            if names is None:
+                raise UnsupportedType(f"{cls.__name__} is recursive")
+            return names
+        self._functions[key] = None
+        check_struct(cls)
+        body = _Body(self, known)
+        body.skipping = skip
+        expr = body.member(cls, "m")
+        body.flush()
+        decode = self.name(f"_{'skip' if skip else 'decode'}_{cls.__name__}_")
+        self.lines.append(f"def {decode}({'buf, p' if skip else self.decode_args}):")
+        self.lines.extend(f"    {line}" for line in body.dec)
+        self.lines.append(f"    return {expr}, p")
+        encode = write = size = ""
+        if not skip:
+            encode = self.name(f"_encode_{cls.__name__}_")
+            self.lines.append(f"def {encode}(out, m):")
+            self.lines.extend(f"    {line}" for line in body.enc)
+            self.lines.append("    return out")
+            write = self.name(f"_write_{cls.__name__}_")
+            self.lines.append(f"def {write}(buf, p, m):")
+            self.lines.extend(f"    {line}" for line in body.wr)
+            self.lines.append("    return p")
+            size = self.name(f"_size_{cls.__name__}_")
+            self.lines.append(f"def {size}(m, p):")
+            self.lines.extend(f"    {line}" for line in body.sz)
+            self.lines.append("    return p")
+        self._functions[key] = (decode, encode, write, size)
+        return decode, encode, write, size
+
+    def projection(self, cls: type, names: List[str]) -> str:
+        # decode(buf, p) -> ({name: value}, p) reading only the named top-level members and
+        # stopping after the last of them
+        check_struct(cls)
+        fields = list(struct_fields(cls).items())
+        last = max(i for i, (name, _) in enumerate(fields) if name in names)
+        body = _Body(self, _MAX_ALIGN)
+        values = {}
+        for name, ftype in fields[:last + 1]:
+            body.skipping = name not in names
+            expr = body.member(ftype, f"m.{name}")
+            if name in names:
+                values[name] = expr
+        body.skipping = False
+        body.flush()
+        project = self.name(f"_project_{cls.__name__}_")
+        self.lines.append(f"def {project}(buf, p):")
+        self.lines.extend(f"    {line}" for line in body.dec)
+        self.lines.append(f"    return {{{', '.join(f'{name!r}: {expr}' for name, expr in values.items())}}}, p")
+        return project
+
+
+def struct_fields(cls: type) -> Dict[str, Any]:
+    return get_extended_type_hints(cls)
+
+
+def check_struct(cls: type) -> None:
+    annotations = get_idl_annotations(cls)
+    if annotations.get("xcdrv2") or annotations.get("extensibility", "final") != "final":
+        raise UnsupportedType(f"{cls.__name__} is not a final XCDR1 struct")
+
+
+class StructCodec:
+    # Generated decode/encode for one IdlStruct, byte-for-byte compatible with pycdr2 (XCDR1, LE)
+    def __init__(self, cls: type, decode: Callable, encode: Callable, write: Callable, size: Callable, source: str):
+        self.cls = cls
+        self.source = source
+        self._decode = decode
+        self._encode = encode
+        self._write = write
+        self._size = size
+        self._decode_blobs: Optional[Callable] = None  # generated on first decode_blobs()
+
+    def decode(self, payload: Any) -> Any:
+        if payload[:4] != HEADER_LE:
+            return self.cls.deserialize(payload)
+        message, pos = self._decode(payload, 4)
+        if pos > len(payload):
+            raise ValueError(f"Truncated {self.cls.__name__} payload: {len(payload)} < {pos} bytes")
+        return message
+
+    def decode_blobs(self, payload: Any, blob: Callable[[memoryview], Any]) -> Any:
+        # decode() with every uint8 sequence member handed to blob() as a memoryview of the payload,
+        # so e.g. an image is copied once, straight into a pooled buffer. The view is only valid
+        # during the call. Payloads pycdr2 has to decode keep their lists.
+        if payload[:4] != HEADER_LE:
+            return self.cls.deserialize(payload)
+        if self._decode_blobs is None:
+            self._decode_blobs = _generate(self.cls, rows=False, blobs=True)[0]
+        view = memoryview(payload)
+        message, pos = self._decode_blobs(view, 4, blob)
+        if pos > len(view):
+            raise ValueError(f"Truncated {self.cls.__name__} payload: {len(view)} < {pos} bytes")
+        return message
+
+    def encoded_size(self, message: Any) -> int:
+        return self._size(message, len(HEADER_LE))
+
+    def encode(self, message: Any) -> bytes:
+        return bytes(self._encode(bytearray(HEADER_LE), message))
+
+    def encode_into(self, message: Any, buffer: Any, offset: int = 0) -> int:
+        # Serialize into a writable buffer (bytearray, numpy array, shared memory view) at offset;
+        # returns the number of bytes written. Positions are relative to offset, so alignment holds.
+        size = self.encoded_size(message)
+        view = memoryview(buffer)
+        if view.format != "B" or view.ndim != 1:
+            view = view.cast("B")
+        if offset < 0 or offset + size > len(view):
+            raise ValueError(f"Buffer too small for {self.cls.__name__}: {len(view) - offset} < {size} bytes")
+        out = view[offset:offset + size]
+        out[:4] = HEADER_LE
+        self._write(out, 4, message)
+        return size
+
+
+def _generate(cls: Any, rows: bool, blobs: bool = False) -> Optional[Tuple[Callable, Callable, Callable, Callable, str]]:
+    # Returns None for types the generator does not cover (unions, optionals, appendable/mutable
+    # structs, non-IdlStruct classes); callers keep using pycdr2 for those.
+    if not (isclass(cls) and issubclass(cls, IdlStruct)):
+        return None
+    builder = _Builder(rows, blobs)
+    try:
+        names = builder.function(cls, known=_MAX_ALIGN)
+    except UnsupportedType as e:
+        log.debug(f"No generated codec for {cls.__name__}: {e}")
+        return None
+    source = "\n".join(builder.lines)
+    exec(compile(source, f"<cdr codec {cls.__name__}>", "exec"), builder.namespace)
+    return (*(builder.namespace.get(name) for name in names), source)
+
+
+def build_struct_codec(cls: Any) -> Optional[StructCodec]:
+    generated = _generate(cls, rows=False)
+    if generated is None:
+        return None
+    return StructCodec(cls, *generated)
+
+
+def build_projection(cls: Any, names: List[str]) -> Optional[Callable[[Any], Dict[str, Any]]]:
+    # decode(payload) -> {name: value} for little-endian XCDR1 payloads; names must be members of cls
+    if not (isclass(cls) and issubclass(cls, IdlStruct)):
+        return None
+    builder = _Builder()
+    try:
+        project = builder.projection(cls, names)
+    except UnsupportedType as e:
+        log.debug(f"No generated projection for {cls.__name__}: {e}")
+        return None
+    exec(compile("\n".join(builder.lines), f"<cdr projection {cls.__name__}>", "exec"), builder.namespace)
+    project_at = builder.namespace[project]
+
+    def decode(payload: Any) -> Dict[str, Any]:
+        values, pos = project_at(payload, 4)
+        if pos > len(payload):
+            raise ValueError(f"Truncated {cls.__name__} payload: {len(payload)} < {pos} bytes")
+        return values
+
+    return decode
+
+
+def build_validator(cls: Any) -> Optional[Callable[[Any], int]]:
+    # end(payload) -> position where a little-endian XCDR1 payload of cls ends according to its
+    # length prefixes; nothing is decoded. Raises struct.error when a prefix lies past the buffer.
+    if not (isclass(cls) and issubclass(cls, IdlStruct)):
+        return None
+    builder = _Builder()
+    try:
+        skip = builder.function(cls, known=_MAX_ALIGN, skip=True)[0]
+    except UnsupportedType as e:
+        log.debug(f"No generated validator for {cls.__name__}: {e}")
+        return None
+    exec(compile("\n".join(builder.lines), f"<cdr validator {cls.__name__}>", "exec"), builder.namespace)
+    skip_at = builder.namespace[skip]
+
+    def end(payload: Any) -> int:
+        return skip_at(payload, 4)[1]
+
+    return end
+
+
+def build_row_decoder(cls: Any) -> Optional[Callable[[Any], tuple]]:
+    # decode(payload) -> tuple of the members for little-endian XCDR1 payloads
+    generated = _generate(cls, rows=True)
+    if generated is None:
+        return None
+    decode_at = generated[0]
+
+    def decode(payload: Any) -> tuple:
+        if payload[:4] != HEADER_LE:
+            raise UnsupportedType("Row decoding needs a little-endian XCDR1 payload")
+        row, pos = decode_at(payload, 4)
+        if pos > len(payload):
+            raise ValueError(f"Truncated {cls.__name__} payload: {len(payload)} < {pos} bytes")
+        return row
+
+    return decode
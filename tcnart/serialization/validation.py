@@ -0,0 +1,99 @@
+from __future__ import annotations
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from .cdr_serialization import MIN_PAYLOAD_SIZE, _TYPE_REGISTRY, decode_raw_message
+from .compression import decompress_payload
+from .error import MessageError
+from .struct_codec import build_validator
+
+# Cheap structural checks run before decoding untrusted payloads: encapsulation header, minimum
+# size and, for little-endian XCDR1 payloads of generated types, every string/sequence length
+# prefix against the buffer size. Failures come back as a PayloadCheck instead of an exception
+# so receivers can drop the sample and report it through a RejectLog.
+
+# DDS encapsulation ids: CDR, PL_CDR (big/little endian) and the XCDR2 variants
+_ENCAPSULATIONS = frozenset({0, 1, 2, 3, 6, 7, 8, 9, 10, 11})
+_VALIDATORS: Dict[str, Optional[Callable[[Any], int]]] = {}
+
+
+@dataclass(frozen=True)
+class PayloadCheck:
+    kind: str = ""  # MessageError kind, empty for payloads that passed
+    detail: str = ""
+
+    def __bool__(self) -> bool:
+        return not self.kind
+
+    def error(self) -> MessageError:
+        return MessageError(self.kind, self.detail)
+
+
+VALID = PayloadCheck()
+
+
+def validate_payload(type_name: str, payload: Any) -> PayloadCheck:
+    size = len(payload)
+    if size < MIN_PAYLOAD_SIZE:
+        return PayloadCheck(MessageError.INVALID_PAYLOAD, f"{size} byte payload is shorter than the CDR header")
+    if payload[0] != 0 or payload[1] not in _ENCAPSULATIONS:
+        return PayloadCheck(MessageError.UNKNOWN_REPRESENTATION, f"Unknown encapsulation {bytes(payload[:2]).hex()}")
+    if payload[1] != 1:
+        return VALID  # only little-endian XCDR1 is checked in depth, pycdr2 handles the rest
+    if type_name not in _VALIDATORS:
+        cls = _TYPE_REGISTRY.get(type_name)
+        _VALIDATORS[type_name] = None if cls is None else build_validator(cls)
+    end = _VALIDATORS[type_name]
+    if end is None:
+        return VALID
+    try:
+        pos = end(payload)
+    except Exception:
+        pos = -1
+    if pos < 0 or pos > size:
+        return PayloadCheck(MessageError.INVALID_PAYLOAD, f"Truncated {type_name} payload of {size} bytes")
+    return VALID
+
+
+def decode_checked(
+    type_name: str, payload: Any, codec: Optional[str] = None, blob: Optional[Callable[[Any], Any]] = None,
+) -> Tuple[Any, PayloadCheck]:
+    # (message, VALID) or (None, failed check); never raises MessageError.
+    # codec names the payload compression signalled in the attachment, if any; blob is passed
+    # on to decode_raw_message.
+    if codec is not None:
+        try:
+            payload = decompress_payload(codec, payload)
+        except MessageError as e:
+            return None, PayloadCheck(e.kind, e.detail)
+    check = validate_payload(type_name, payload)
+    if not check:
+        return None, check
+    try:
+        return decode_raw_message(type_name, payload, blob), VALID
+    except MessageError as e:
+        return None, PayloadCheck(e.kind, e.detail)
+
+
+class RejectLog:
+    # Rate-limited warnings for rejected payloads: the first rejection is logged, later ones at
+    # most once per interval with the number suppressed in between. One per receiver thread.
+    def __init__(self, logger: logging.Logger, interval_s: float = 5.0):
+        self.logger = logger
+        self.interval_s = float(interval_s)
+        self.rejected = 0
+        self._suppressed = 0
+        self._next = 0.0
+
+    def report(self, source: str, check: PayloadCheck) -> None:
+        self.rejected += 1
+        now = time.monotonic()
+        if now < self._next:
+            self._suppressed += 1
+            return
+        suppressed = f" ({self._suppressed} more since last report)" if self._suppressed else ""
+        self.logger.warning(f"Dropped payload from {source}: {check.kind}: {check.detail}{suppressed}")
+        self._suppressed = 0
+        self._next = now + self.interval_s
@@ -0,0 +1,56 @@
+import random
+import struct
+from enum import Enum
+from inspect import isclass
+from typing import Any, Callable
+
+import pytest
+from pycdr2 import IdlStruct, IdlUnion
+from pycdr2._type_helper import get_args, get_origin
+from pycdr2._type_normalize import get_extended_type_hints
+from pycdr2.types import array, bounded_str, sequence, typedef, _type_code_align_size_default_mapping
+
+import tcnart.core  # noqa: F401 (registers PixelImage)
+import tcnart.schema.messages.srg_engine  # noqa: F401
+
+
+def random_value(_type: Any, rng: random.Random, max_items: int = 3) -> Any:
+    # Random member value of a pycdr2 type, covering the full range of every primitive
+    if isinstance(_type, typedef):
+        return random_value(_type.subtype, rng, max_items)
+    if _type is str or isinstance(_type, bounded_str):
+        return "".join(rng.choice("abcä€xyz") for _ in range(rng.randint(0, 9)))
+    if _type is bytes:
+        return bytes(rng.randint(0, 255) for _ in range(rng.randint(0, 9)))
+    if _type in _type_code_align_size_default_mapping:
+        code = _type_code_align_size_default_mapping[_type][0]
+        if code == "?":
+            return rng.random() < 0.5
+        if code == "f":
+            return struct.unpack("<f", struct.pack("<f", rng.uniform(-1e3, 1e3)))[0]
+        if code == "d":
+            return rng.uniform(-1e3, 1e3)
+        bits = struct.calcsize(code) * 8
+        if code.islower():
+            return rng.randint(-(1 << bits - 1), (1 << bits - 1) - 1)
+        return rng.randint(0, (1 << bits) - 1)
+    if isclass(_type) and issubclass(_type, Enum):
+        return rng.choice(list(_type))
+    if isclass(_type) and issubclass(_type, IdlStruct):
+        return _type(**{name: random_value(ftype, rng, max_items) for name, ftype in get_extended_type_hints(_type).items()})
+    if isclass(_type) and issubclass(_type, IdlUnion):
+        return _type()
+    if isinstance(_type, array):
+        return [random_value(_type.subtype, rng, max_items) for _ in range(_type.length)]
+    if isinstance(_type, sequence):
+        return [random_value(_type.subtype, rng, max_items) for _ in range(rng.randint(0, max_items))]
+    if get_origin(_type) == list:
+        return [random_value(get_args(_type)[0], rng, max_items) for _ in range(rng.randint(0, max_items))]
+    raise TypeError(f"No random value for {_type}")
+
+
+@pytest.fixture
+def random_message() -> Callable[[type, int], Any]:
+    def make(cls: type, seed: int = 0) -> Any:
+        return random_value(cls, random.Random(seed))
+    return make
@@ -0,0 +1,53 @@
+import gc
+
+import numpy as np
+
+from tcnart.core.buffer_pool import BufferPool
+from tcnart.schema.messages.video import VideoStreamMessage
+from tcnart.serialization.cdr_serialization import decode_raw_message, encode_raw_message
+
+
+def test_released_buffers_are_reused():
+    pool = BufferPool(4, count=2)
+    view = pool.fill(b"abcd")
+    assert bytes(view) == b"abcd" and pool.available() == 1
+    pool.release(view)
+    assert pool.available() == 2
+    assert pool.stats.allocated == 2
+
+
+def test_double_release_is_ignored():
+    pool = BufferPool(4, count=2)
+    a = pool.acquire()
+    pool.release(a)
+    pool.release(a)
+    assert pool.available() == 2 and pool.stats.double_released == 1
+    assert pool.acquire() is not pool.acquire()
+
+
+def test_unreleased_buffers_are_not_kept_alive():
+    pool = BufferPool(100, count=1)
+    for _ in range(50):
+        pool.fill(b"x" * 100)
+    gc.collect()
+    assert len(pool._owned) == 0
+
+
+def test_other_sizes_get_a_plain_copy():
+    pool = BufferPool(4, count=1)
+    for data in (b"abcdef", b"ab", memoryview(b"abc"), [1, 2, 3]):
+        view = pool.fill(data)
+        assert bytes(view) == bytes(data)
+        pool.release(view)
+    assert pool.stats.unpooled == 4 and pool.available() == 1 and pool.stats.reused == 0
+
+
+def test_image_decodes_into_pooled_buffer():
+    image = np.arange(4096, dtype=np.uint32).astype(np.uint8)
+    payload = encode_raw_message(VideoStreamMessage(image=image.tolist()))
+    pool = BufferPool(4096, count=1)
+    message = decode_raw_message("tcnart_msgs::msg::VideoStreamMessage", payload, pool.fill)
+    assert isinstance(message.image, np.ndarray) and np.array_equal(message.image, image)
+    assert pool.available() == 0
+    pool.release(message.image)
+    assert pool.available() == 1
@@ -0,0 +1,20 @@
+from tcnart.core.clock import ClockOffsetEstimator, offset_sign_plausible
+from tcnart.core.frames import Frame, TimestampGrouper, TimestampMatcherType
+
+MS = 1_000_000
+
+
+def test_grouper_trains_estimator():
+    estimator = ClockOffsetEstimator()
+    grouper = TimestampGrouper(["a", "b"], TimestampMatcherType.new_window(10), clock_estimator=estimator)
+    for i in range(1, 200):
+        ts = i * 33 * MS
+        grouper.push(Frame.create(estimator.correct(0, ts), 0, 0, object()))
+        grouper.push(Frame.create(estimator.correct(1, ts + 3 * MS), 0, 1, object()))
+    assert abs(estimator.get_offset_ns(1) - 3 * MS) < 1000
+    assert abs(estimator.correct(1, 10_000 * MS + 3 * MS) - 10_000 * MS) < 1000
+
+
+def test_offset_sign():
+    assert offset_sign_plausible(100, 1000, 1100)
+    assert not offset_sign_plausible(2100, 1000, 1100)
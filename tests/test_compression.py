@@ -0,0 +1,80 @@
+import zlib
+
+import numpy as np
+import pytest
+
+from tcnart.serialization import compression
+from tcnart.serialization.compression import (
+    available_payload_codecs, compress_payload, decompress_payload, join_attachment, split_attachment,
+)
+from tcnart.serialization.error import MessageError
+
+
+def depth_frame() -> bytes:
+    y, x = np.mgrid[0:720, 0:1280]
+    return (1000 + (x + y) // 4).astype(np.uint16).tobytes()
+
+
+@pytest.mark.parametrize("name", available_payload_codecs())
+def test_roundtrip(name):
+    payload = depth_frame()
+    frame = compress_payload(name, payload)
+    assert len(frame) < len(payload)
+    assert decompress_payload(name, frame) == payload
+
+
+def test_incompressible_chunks_are_stored():
+    payload = np.random.default_rng(0).integers(0, 256, compression.CHUNK_SIZE + 10, dtype=np.uint8).tobytes()
+    frame = compress_payload("zlib", payload)
+    assert len(frame) == len(payload) + 4 + 2 * 8
+    assert decompress_payload("zlib", frame) == payload
+
+
+def test_malformed_frames_raise_message_error():
+    frame = compress_payload("zlib", depth_frame())
+    for bad in (frame[:3], frame[:-1], frame + b"x", b"\xff\xff\xff\xff" + frame[4:]):
+        with pytest.raises(MessageError):
+            decompress_payload("zlib", bad)
+    with pytest.raises(MessageError):
+        decompress_payload("no-such-codec", frame)
+
+
+def test_chunk_size_mismatch_is_rejected():
+    data = zlib.compress(b"\0" * 100)
+    frame = compression._COUNT.pack(1) + compression._CHUNK.pack(200, len(data)) + data
+    with pytest.raises(MessageError):
+        decompress_payload("zlib", frame)
+
+
+def test_attachment():
+    assert split_attachment(join_attachment("t::Msg", "zlib")) == ("t::Msg", "zlib")
+    assert split_attachment(join_attachment("t::Msg", None)) == ("t::Msg", None)
+
+
+def frame_of(chunks) -> bytes:
+    header = compression._COUNT.pack(len(chunks)) + b"".join(compression._CHUNK.pack(raw, len(data)) for raw, data in chunks)
+    return header + b"".join(data for _, data in chunks)
+
+
+@pytest.mark.parametrize("chunks", [
+    [(compression.CHUNK_SIZE + 1, zlib.compress(b"\0" * 100))],  # larger than a chunk
+    [(100, zlib.compress(b"\0" * 100)), (100, zlib.compress(b"\0" * 100))],  # short chunk before the last
+    [(10, b"x" * 11)],  # stored larger than raw
+])
+def test_implausible_chunk_sizes_are_rejected(chunks):
+    with pytest.raises(MessageError) as e:
+        decompress_payload("zlib", frame_of(chunks))
+    assert e.value.kind == MessageError.INVALID_PAYLOAD
+
+
+def test_decompression_bomb_is_rejected_before_decompressing(monkeypatch):
+    calls = []
+    monkeypatch.setattr(compression, "MAX_PAYLOAD_SIZE", 4 * compression.CHUNK_SIZE)
+    bomb = zlib.compress(b"\0" * compression.CHUNK_SIZE, 9)
+    monkeypatch.setitem(compression._PAYLOAD_CODECS, "zlib", compression.PayloadCodec(
+        "zlib", zlib.compress, lambda data, size: calls.append(size) or compression._zlib_decompress(data, size)))
+    assert len(decompress_payload("zlib", frame_of([(compression.CHUNK_SIZE, bomb)] * 4))) == 4 * compression.CHUNK_SIZE
+    calls.clear()
+    with pytest.raises(MessageError):
+        decompress_payload("zlib", frame_of([(compression.CHUNK_SIZE, bomb)] * 5))
+    assert calls == []
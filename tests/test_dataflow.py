@@ -0,0 +1,101 @@
+import queue
+import random
+import time
+
+from tcnart.core.dataflow import Dataflow
+from tcnart.core.frames import Frame, TimestampMatcherType
+
+MS = 1_000_000
+
+
+def test_stages_run_in_order_and_count():
+    out = []
+    flow = Dataflow(queue_size=4)
+    flow.add_stage("double", lambda x: 2 * x)
+    flow.add_stage("drop_odd", lambda x: x if x % 4 == 0 else None)
+    flow.add_stage("collect", out.append)
+    flow.start()
+    for i in range(100):
+        flow.put(i)
+    flow.close()
+    flow.join()
+    assert out == [2 * i for i in range(100) if i % 2 == 0]
+    stats = flow.stats()
+    assert stats["double"].items_in == 100 and stats["drop_odd"].items_out == 50
+
+
+def test_stage_errors_are_counted():
+    flow = Dataflow()
+    flow.add_stage("fail", lambda x: 1 // x)
+    flow.start()
+    for i in range(3):
+        flow.put(i)
+    flow.close()
+    flow.join()
+    assert flow.stats()["fail"].errors == 1
+
+
+def test_grouper_stage_flushes_on_close():
+    groups = []
+    flow = Dataflow()
+    flow.add_grouper(["a", "b"], TimestampMatcherType.new_window(5), reorder_max_frames=4)
+    flow.add_stage("collect", groups.append)
+    flow.start()
+    for i in range(1, 11):
+        for s in (0, 1):
+            flow.put(Frame.create(i * 33 * MS, 0, s, object()))
+    flow.close()
+    flow.join()
+    assert len(groups) == 10
+
+
+def test_parallel_stage_keeps_put_order():
+    out = []
+    rng = random.Random(0)
+    delays = [rng.random() * 1e-3 if rng.random() < 0.2 else 0.0 for _ in range(500)]
+    flow = Dataflow(queue_size=8)
+    flow.add_stage("slow", lambda i: (time.sleep(delays[i]), i)[1], workers=4)
+    flow.add_stage("fan_out", lambda i: [i, i] if i % 3 else [], workers=3, flat=True)
+    flow.add_stage("collect", out.append)
+    flow.start()
+    for i in range(500):
+        flow.put(i)
+    flow.close()
+    flow.join()
+    assert out == [i for i in range(500) if i % 3 for _ in range(2)]
+
+
+def test_preempted_workers_do_not_lose_groups():
+    groups = []
+    rng = random.Random(1)
+
+    def decode(frame):
+        if rng.random() < 0.05:
+            time.sleep(0.002)  # a worker that gets preempted is overtaken by the others
+        return frame
+
+    flow = Dataflow(queue_size=16)
+    flow.add_stage("decode", decode, workers=4)
+    grouper = flow.add_grouper(["a", "b", "c"], TimestampMatcherType.new_window(5), max_pending_groups=4)
+    flow.add_stage("collect", groups.append)
+    flow.start()
+    for i in range(1, 301):
+        for s in (0, 1, 2):
+            flow.put(Frame.create(i * 33 * MS, 0, s, object()))
+    flow.close()
+    flow.join()
+    assert len(groups) == 300
+    assert grouper.stats.evicted_groups == 0 and not grouper.stats.orphaned_frames
+
+
+def test_idle_grouper_stage_emits_expired_groups():
+    groups = queue.Queue()
+    flow = Dataflow()
+    flow.add_grouper(["a", "b"], TimestampMatcherType.new_window(5), deadline_ms=20)
+    flow.add_stage("collect", groups.put)
+    flow.start()
+    flow.put(Frame.create(33 * MS, 0, 0, object()))
+    group = groups.get(timeout=2)  # no further frames: only the idle poll can emit it
+    assert group.missing_channels() == ["b"]
+    flow.close()
+    flow.join()
@@ -0,0 +1,72 @@
+import dataclasses
+import pickle
+import random
+from dataclasses import FrozenInstanceError
+
+import pytest
+
+from tcnart.schema.messages.camera import CameraSensorMessage
+from tcnart.serialization.cdr_serialization import decode_raw_message, encode_raw_message, set_decode_cache
+from tcnart.serialization.decode_cache import DecodeCache, FrozenMessage, freeze_message, thaw_message
+
+from conftest import random_value
+
+NAME = "pcpd_msgs::msg::CameraSensor"
+
+
+@pytest.fixture
+def cache():
+    cache = DecodeCache(max_entries=2)
+    set_decode_cache(cache)
+    yield cache
+    set_decode_cache(None)
+
+
+def sensor(seed: int) -> CameraSensorMessage:
+    return random_value(CameraSensorMessage, random.Random(seed))
+
+
+def test_hits_share_one_frozen_instance(cache):
+    payload = encode_raw_message(sensor(0))
+    first = decode_raw_message(NAME, payload)
+    assert decode_raw_message(NAME, payload) is first
+    assert isinstance(first, FrozenMessage)
+    assert cache.stats.hits == 1 and cache.stats.misses == 1
+
+
+def test_lru_eviction(cache):
+    payloads = [encode_raw_message(sensor(i)) for i in range(3)]
+    for payload in payloads:
+        decode_raw_message(NAME, payload)
+    assert len(cache) == 2 and cache.stats.evictions == 1
+
+
+def test_uncached_types_bypass(cache):
+    from tcnart.schema.messages.video import VideoStreamMessage
+    payload = encode_raw_message(VideoStreamMessage())
+    assert not isinstance(decode_raw_message("tcnart_msgs::msg::VideoStreamMessage", payload), FrozenMessage)
+    assert cache.stats.bypassed == 1
+
+
+def test_frozen_messages_are_read_only_and_compare_equal():
+    message = sensor(1)
+    frozen = freeze_message(message)
+    with pytest.raises(FrozenInstanceError):
+        frozen.name = "other"
+    assert frozen == message and message == frozen
+    assert frozen != sensor(2)
+    assert thaw_message(frozen) == message
+    assert type(pickle.loads(pickle.dumps(frozen))) is CameraSensorMessage
+    assert frozen.serialize() == message.serialize()
+
+
+def test_replace_builds_a_new_frozen_message():
+    message = sensor(3)
+    frozen = freeze_message(message)
+    changed = dataclasses.replace(frozen, name="other", raw_calibration=[1, 2])
+    assert type(changed) is type(frozen) and changed.name == "other"
+    assert changed.raw_calibration == (1, 2) and isinstance(changed.depth_parameters, FrozenMessage)
+    assert frozen.name == message.name
+    assert thaw_message(changed) == dataclasses.replace(message, name="other", raw_calibration=[1, 2])
+    with pytest.raises(FrozenInstanceError):
+        changed.name = "again"
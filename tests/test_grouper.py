@@ -0,0 +1,175 @@
+import random
+
+import numpy as np
+
+from tcnart.core.dataflow import GrouperSink
+from tcnart.core.frames import (
+    Frame, FrameAnnotation, ReorderBuffer, SharedAnnotations, TimestampGrouper, TimestampMatcherType, group_timestamp_arrays,
+)
+
+MS = 1_000_000
+CHANNELS = ["color", "depth", "ir"]
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0
+
+    def __call__(self) -> int:
+        return self.now
+
+
+def frame(ts: int, stream_id: int) -> Frame:
+    return Frame.create(ts, 0, stream_id, object())
+
+
+def frames_for(refs, jitter_ms: int = 0, seed: int = 0):
+    rng = random.Random(seed)
+    return [frame(ref + rng.randint(0, jitter_ms * MS), s) for ref in refs for s in range(len(CHANNELS))]
+
+
+def refs(groups):
+    return [g.get_ref_timestamp() for g in groups]
+
+
+def test_exact_matching_groups_all_channels():
+    grouper = TimestampGrouper(CHANNELS)
+    groups = list(grouper.process(frames_for([i * 33 * MS for i in range(1, 11)])))
+    assert len(groups) == 10
+    assert all(g.is_complete() for g in groups)
+    assert grouper.pending() == 0
+
+
+def test_window_matching_tolerates_jitter():
+    grouper = TimestampGrouper(CHANNELS, TimestampMatcherType.new_window(5))
+    groups = list(grouper.process(frames_for([i * 33 * MS for i in range(1, 101)], jitter_ms=4, seed=1)))
+    assert len(groups) == 100
+    assert all(g.max_timestamp() - g.min_timestamp() <= 5 * MS for g in groups)
+
+
+def test_completed_group_drops_older_unfinished_groups():
+    grouper = TimestampGrouper(CHANNELS)
+    grouper.push(frame(33 * MS, 0))
+    out = []
+    for s in range(3):
+        out += grouper.push(frame(66 * MS, s))
+    assert refs(out) == [66 * MS]
+    assert grouper.pending() == 0
+    assert grouper.stats.evicted_groups == 1
+    assert grouper.stats.orphaned_frames == {"color": 1}
+
+
+def test_nearest_matching_prefers_closest_frame():
+    grouper = TimestampGrouper(["a", "b"], TimestampMatcherType.new_nearest(10))
+    out = grouper.push(frame(100 * MS, 0))
+    out += grouper.push(frame(108 * MS, 1))
+    assert out and out[0].get_frame("b").get_timestamp() == 108 * MS
+
+
+def test_pending_limit_evicts_and_counts_orphans():
+    grouper = TimestampGrouper(CHANNELS, max_pending_groups=2)
+    for i in range(1, 6):
+        grouper.push(frame(i * 33 * MS, 0))
+    assert grouper.pending() == 2
+    assert grouper.stats.evicted_groups == 3
+    assert grouper.stats.orphaned_frames == {"color": 3}
+
+
+def test_deadline_emits_partial_group():
+    clock = FakeClock()
+    grouper = TimestampGrouper(CHANNELS, deadline_ms=50, clock=clock)
+    assert grouper.push(frame(33 * MS, 0)) == []
+    clock.now = 60 * MS
+    groups = grouper.flush_expired()
+    assert len(groups) == 1
+    assert groups[0].missing_channels() == ["depth", "ir"]
+    assert grouper.stats.partial_groups == 1
+
+
+def test_reorder_buffer_releases_in_order():
+    buf = ReorderBuffer(max_frames=3)
+    out = []
+    for ts in (5, 3, 4, 1, 2, 8, 6, 7, 9, 10):
+        out += buf.push(frame(ts, 0))
+    out += buf.flush()
+    released = [f.get_timestamp() for f in out]
+    assert released == sorted(released)
+    assert buf.stats.reordered_frames > 0
+
+
+def test_reorder_buffer_hold_limit():
+    clock = FakeClock()
+    buf = ReorderBuffer(max_frames=10, max_hold_ms=50, clock=clock)
+    assert buf.push(frame(30, 0)) == [] and buf.push(frame(10, 0)) == []
+    clock.now = 40 * MS
+    assert buf.push(frame(20, 0)) == []
+    clock.now = 60 * MS
+    assert [f.get_timestamp() for f in buf.release_expired()] == [10, 20, 30]
+    assert buf.next_expiry() is None
+
+
+def test_stalled_stream_is_released_at_its_hold_deadline():
+    clock = FakeClock()
+    grouper = TimestampGrouper(["a", "b"], reorder_max_frames=100, reorder_max_hold_ms=50, clock=clock)
+    grouper.push(frame(33 * MS, 1))  # stream b stalls after this frame
+    clock.now = 20 * MS
+    assert grouper.push(frame(33 * MS, 0)) == []
+    assert grouper.reorder_buffers[1].next_expiry() == 50 * MS
+    clock.now = 49 * MS
+    assert grouper.flush_expired() == []
+    clock.now = 50 * MS
+    assert grouper.flush_expired() == []
+    assert grouper.get_reorder_stats()["b"].expired_frames == 1
+    clock.now = 70 * MS
+    assert refs(grouper.flush_expired()) == [33 * MS]
+    assert grouper.get_reorder_stats()["a"].expired_frames == 1
+
+
+def test_grouper_sink_collects_groups_from_workers():
+    out = []
+    sink = GrouperSink(CHANNELS, 3, out)
+    senders = sink.worker_senders()
+    for f in frames_for([i * 33 * MS for i in range(1, 21)]):
+        senders[f.get_stream_id()].put(f)
+    assert len(out) == 20
+    assert sink.get_stats().emitted_groups == 20
+
+
+def test_vectorised_grouping_matches_online_grouper():
+    rng = np.random.default_rng(4)
+    base = np.arange(1, 201, dtype=np.int64) * 33 * MS
+    channel_ts = [base + rng.integers(0, 3 * MS, base.size) for _ in CHANNELS]
+    matcher = TimestampMatcherType.new_window(5)
+    indices = group_timestamp_arrays(channel_ts, matcher)
+    assert all(len(idx) == 200 for idx in indices)
+    online = list(TimestampGrouper(CHANNELS, matcher).process(
+        [frame(int(ts[i]), s) for i in range(base.size) for s, ts in enumerate(channel_ts)]))
+    assert len(online) == 200
+
+
+def test_frame_annotations_copy_on_write():
+    shared = SharedAnnotations({"st": FrameAnnotation.semantic_type(1)})
+    a = Frame.create(1, 0, 0, object(), shared)
+    b = Frame.create(2, 0, 0, object(), shared)
+    a.add_annotation("extra", FrameAnnotation.semantic_type(2))
+    assert "extra" in a.get_annotations() and "extra" not in b.get_annotations()
+
+
+def test_late_frame_after_deadline_is_orphaned():
+    clock = FakeClock()
+    grouper = TimestampGrouper(CHANNELS, TimestampMatcherType.new_window(5), deadline_ms=50, clock=clock)
+    grouper.push(frame(33 * MS, 0))
+    grouper.push(frame(34 * MS, 1))
+    clock.now = 60 * MS
+    assert [g.missing_channels() for g in grouper.flush_expired()] == [["ir"]]
+    # The missing frame arrives after the partial group was emitted
+    assert grouper.push(frame(35 * MS, 2)) == []
+    assert grouper.pending() == 0
+    assert grouper.stats.orphaned_frames == {"ir": 1}
+    clock.now = 200 * MS
+    assert grouper.flush_expired() == []
+    assert grouper.stats.partial_groups == 1
+    # Frames of the next group are unaffected
+    for s in range(3):
+        groups = grouper.push(frame(66 * MS, s))
+    assert refs(groups) == [66 * MS]
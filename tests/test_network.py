@@ -0,0 +1,25 @@
+import pytest
+import zenoh
+
+from tcnart.network.common import _extract_payload, create_shm_provider, zenoh_shm
+from tcnart.serialization.error import MessageError
+
+
+class Sample:
+    def __init__(self, payload):
+        self.payload = payload
+
+
+def test_extract_payload():
+    assert _extract_payload(Sample(b"abc")) == b"abc"
+    assert _extract_payload(Sample(zenoh.ZBytes(b"abc"))) == b"abc"
+
+
+@pytest.mark.skipif(zenoh_shm is None, reason="zenoh built without shared memory")
+def test_shm_provider_requires_enabled_config():
+    config = zenoh.Config()
+    config.insert_json5("transport/shared_memory/enabled", "false")
+    with pytest.raises(MessageError, match="shared_memory/enabled"):
+        create_shm_provider(config, 1 << 16)
+    config.insert_json5("transport/shared_memory/enabled", "true")
+    assert create_shm_provider(config, 1 << 16) is not None
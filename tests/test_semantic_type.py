@@ -0,0 +1,31 @@
+import pickle
+import random
+from dataclasses import FrozenInstanceError
+
+import pytest
+
+from tcnart.core.datamodel import geometry_types, image_types, transform_types
+from tcnart.core.semantic_type import InternedSemanticType, ScalarType, SemanticType, parse_semantic_type
+
+PREDEFINED = [v for types in (image_types, geometry_types, transform_types) for k, v in vars(types).items() if k.isupper()]
+
+
+@pytest.mark.parametrize("identifier", PREDEFINED + [random.Random(0).getrandbits(64) for _ in range(20)])
+def test_interned_parse_matches_semantic_type(identifier):
+    interned = parse_semantic_type(identifier)
+    plain = SemanticType(identifier)
+    assert repr(interned) == repr(plain)
+    assert int(interned.to_identifier()) == int(plain.to_identifier())
+    assert interned.base_type == plain.base_type and plain.base_type == interned.base_type
+
+
+def test_predefined_ids_are_shared_and_read_only():
+    st = parse_semantic_type(image_types.DEPTH_UNCOMPRESSED_IMAGE_2D)
+    assert isinstance(st, InternedSemanticType)
+    assert parse_semantic_type(image_types.DEPTH_UNCOMPRESSED_IMAGE_2D) is st
+    with pytest.raises(FrozenInstanceError):
+        st.set_scalar_type(ScalarType.Int16)
+    assert pickle.loads(pickle.dumps(st)) is st
+    mutable = SemanticType(image_types.DEPTH_UNCOMPRESSED_IMAGE_2D)
+    mutable.set_scalar_type(ScalarType.Int16)
+    assert mutable.scalar_type() == ScalarType.Int16
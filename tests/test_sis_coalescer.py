@@ -0,0 +1,62 @@
+from tcnart.network.sis_subscriber import SISJoinCoalescer
+from tcnart.schema.messages.srg_engine import SISComponentMessage, SISJoinMessage
+from tcnart.serialization.cdr_serialization import encode_raw_message
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def join(*names: str) -> SISJoinMessage:
+    msg = SISJoinMessage(components=[SISComponentMessage() for _ in names])
+    for component, name in zip(msg.components, names):
+        component.node.name = name
+    return msg
+
+
+def receive(coalescer, topic, msg):
+    digest = coalescer.digest(encode_raw_message(msg))
+    if coalescer.is_repeat(topic, digest):
+        return "repeat"
+    return coalescer.update(topic, digest, msg)
+
+
+def test_repeats_are_dropped_and_updates_diffed():
+    coalescer = SISJoinCoalescer()
+    assert [c.node.name for c in receive(coalescer, "t", join("a")).added_components] == ["a"]
+    assert receive(coalescer, "t", join("a")) == "repeat"
+    diff = receive(coalescer, "t", join("b"))
+    assert [c.node.name for c in diff.added_components] == ["b"]
+    assert [c.node.name for c in diff.removed_components] == ["a"]
+
+
+def test_silent_topics_are_pruned():
+    clock = FakeClock()
+    coalescer = SISJoinCoalescer(max_idle_s=10, clock=clock)
+    receive(coalescer, "gone", join("a"))
+    receive(coalescer, "alive", join("b"))
+    for now in (5, 9):
+        clock.now = now
+        assert receive(coalescer, "alive", join("b")) == "repeat"
+        assert coalescer.prune() == []
+    clock.now = 12
+    pruned = coalescer.prune()
+    assert [topic for topic, _ in pruned] == ["gone"]
+    assert [c.node.name for c in pruned[0][1].removed_components] == ["a"]
+    assert list(coalescer._digests) == ["alive"]
+    # A topic that comes back is announced from scratch
+    clock.now = 20
+    assert [topic for topic, _ in coalescer.prune()] == ["alive"]
+    assert [c.node.name for c in receive(coalescer, "alive", join("b")).added_components] == ["b"]
+
+
+def test_deleted_topic_is_forgotten():
+    coalescer = SISJoinCoalescer()
+    receive(coalescer, "t", join("a"))
+    assert [c.node.name for c in coalescer.forget("t").removed_components] == ["a"]
+    assert coalescer.forget("t") is None
+    assert receive(coalescer, "t", join("a")) != "repeat"
@@ -0,0 +1,101 @@
+import random
+import struct
+
+import pytest
+from pycdr2 import IdlStruct
+
+import tcnart.schema.types.common as common_types
+import tcnart.schema.types.math as math_types
+import tcnart.schema.types.primitives as primitive_types
+import tcnart.schema.types.transform as transform_types
+from tcnart.serialization.cdr_serialization import _CODECS, _TYPE_REGISTRY, decode_fields, decode_raw_message, encode_raw_message
+from tcnart.serialization.struct_codec import build_projection, build_struct_codec, build_validator
+from tcnart.serialization.validation import validate_payload
+
+from conftest import random_value
+
+SCHEMA_TYPES = sorted(
+    {v for mod in (common_types, math_types, primitive_types, transform_types) for v in vars(mod).values()
+     if isinstance(v, type) and issubclass(v, IdlStruct) and v is not IdlStruct}
+    | {cls for cls in _TYPE_REGISTRY.values() if isinstance(cls, type) and issubclass(cls, IdlStruct)},
+    key=lambda cls: cls.__name__,
+)
+CODEC_TYPES = [cls for cls in SCHEMA_TYPES if build_struct_codec(cls) is not None]
+
+
+def test_registered_messages_have_generated_codecs():
+    assert len(_CODECS) >= 10
+
+
+@pytest.mark.parametrize("cls", CODEC_TYPES, ids=lambda cls: cls.__name__)
+def test_byte_compatible_with_pycdr2(cls):
+    codec = build_struct_codec(cls)
+    rng = random.Random(cls.__name__)
+    for _ in range(50):
+        message = random_value(cls, rng)
+        reference = message.serialize()
+        assert codec.encode(message) == reference
+        assert codec.encoded_size(message) == len(reference)
+        assert codec.decode(reference) == cls.deserialize(reference)
+        assert codec.decode(memoryview(reference)) == cls.deserialize(reference)
+
+
+@pytest.mark.parametrize("cls", CODEC_TYPES, ids=lambda cls: cls.__name__)
+def test_encode_into_offsets(cls):
+    codec = build_struct_codec(cls)
+    message = random_value(cls, random.Random(1))
+    reference = message.serialize()
+    for offset in (0, 3, 13):
+        buf = bytearray(b"\xff" * (len(reference) + offset + 5))
+        assert codec.encode_into(message, buf, offset) == len(reference)
+        assert bytes(buf[offset:offset + len(reference)]) == reference
+        assert buf[offset + len(reference):] == b"\xff" * 5
+    with pytest.raises(ValueError):
+        codec.encode_into(message, bytearray(len(reference) - 1))
+
+
+@pytest.mark.parametrize("cls", CODEC_TYPES, ids=lambda cls: cls.__name__)
+def test_truncated_payloads_rejected(cls):
+    codec = build_struct_codec(cls)
+    end = build_validator(cls)
+    payload = random_value(cls, random.Random(2)).serialize()
+    assert end(payload) <= len(payload)
+    for cut in range(4, len(payload)):
+        truncated = payload[:cut]
+        try:
+            assert end(truncated) > cut
+        except struct.error:
+            pass
+        with pytest.raises(Exception):
+            codec.decode(truncated)
+
+
+@pytest.mark.parametrize("cls", CODEC_TYPES, ids=lambda cls: cls.__name__)
+def test_decode_blobs_matches_decode(cls):
+    codec = build_struct_codec(cls)
+    payload = random_value(cls, random.Random(3), max_items=5).serialize()
+    assert codec.decode_blobs(payload, list) == codec.decode(payload)
+
+
+@pytest.mark.parametrize("cls", CODEC_TYPES, ids=lambda cls: cls.__name__)
+def test_projection_matches_full_decode(cls):
+    message = random_value(cls, random.Random(4))
+    payload = message.serialize()
+    names = list(vars(message))
+    for picked in (names[:1], names[-1:], names[::2]):
+        project = build_projection(cls, picked)
+        decoded = cls.deserialize(payload)
+        assert project(payload) == {name: getattr(decoded, name) for name in picked}
+
+
+@pytest.mark.parametrize("name", sorted(_CODECS))
+def test_registered_roundtrip_and_validation(name):
+    cls = _TYPE_REGISTRY[name]
+    message = random_value(cls, random.Random(name))
+    payload = encode_raw_message(message)
+    assert decode_raw_message(name, payload) == message
+    assert validate_payload(name, payload)
+    assert not validate_payload(name, payload[:-1])
+    assert not validate_payload(name, payload[:3])
+    field = next(iter(vars(message)))
+    assert decode_fields(name, payload, [field]) == {field: getattr(message, field)}
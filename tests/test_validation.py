@@ -0,0 +1,36 @@
+import logging
+
+from tcnart.schema.messages.video import VideoStreamMessage
+from tcnart.serialization.cdr_serialization import encode_raw_message
+from tcnart.serialization.error import MessageError
+from tcnart.serialization.validation import RejectLog, decode_checked, validate_payload
+
+NAME = "tcnart_msgs::msg::VideoStreamMessage"
+
+
+def test_bogus_length_prefix_is_rejected_without_decoding():
+    payload = bytearray(encode_raw_message(VideoStreamMessage(image=[1, 2, 3])))
+    payload[-7:-3] = (1 << 31).to_bytes(4, "little")  # image length prefix
+    check = validate_payload(NAME, bytes(payload))
+    assert not check and check.kind == MessageError.INVALID_PAYLOAD
+
+
+def test_unknown_encapsulation():
+    assert validate_payload(NAME, b"\x00\x42\x00\x00").kind == MessageError.UNKNOWN_REPRESENTATION
+
+
+def test_decode_checked_never_raises():
+    message, check = decode_checked(NAME, b"\x00\x01")
+    assert message is None and not check
+    message, check = decode_checked(NAME, encode_raw_message(VideoStreamMessage(image=[7])))
+    assert check and message.image == [7]
+
+
+def test_reject_log_rate_limits(caplog):
+    rejects = RejectLog(logging.getLogger("test"), interval_s=60)
+    check = validate_payload(NAME, b"")
+    with caplog.at_level(logging.WARNING):
+        for _ in range(10):
+            rejects.report("cam", check)
+    assert rejects.rejected == 10
+    assert len(caplog.records) == 1